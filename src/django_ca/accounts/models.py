@@ -1,17 +1,36 @@
 from __future__ import annotations
 
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar, Self
 
 from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from django_ca.lib.auth import USER_CACHE
+from django_ca.lib.cache import get_or_set, make_key
 from django_ca.lib.models import BaseModel, BaseQuerySet
 
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+
+    from django.db.models.base import ModelBase
+
+DEFAULT_ORGANISATION_CACHE = "default_organisation"
+
 
 class OrganisationManager(models.Manager.from_queryset(BaseQuerySet["Organisation"])):  # type: ignore[misc]
     def get_or_create_default_org(self, *, for_ca: bool) -> tuple[Organisation, bool]:
+        created = False
+
+        def load() -> Organisation:
+            nonlocal created
+            organisation, created = self._get_or_create_default_org(for_ca=for_ca)
+            return organisation
+
+        return get_or_set(DEFAULT_ORGANISATION_CACHE, for_ca, load), created
+
+    def _get_or_create_default_org(self, *, for_ca: bool) -> tuple[Organisation, bool]:
         try:
             organisation = self.get(ca_rights=for_ca)
         except Organisation.DoesNotExist:
@@ -158,6 +177,11 @@ class Organisation(BaseModel):
     def __str__(self) -> str:
         return self.name
 
+    def cache_keys(self) -> list[str]:
+        return [
+            make_key(DEFAULT_ORGANISATION_CACHE, for_ca) for for_ca in (True, False)
+        ]
+
 
 class User(AbstractUser, BaseModel):
     username = None  # type: ignore[assignment]
@@ -173,9 +197,37 @@ class User(AbstractUser, BaseModel):
     REQUIRED_FIELDS: ClassVar[list[str]] = []
 
     objects: ClassVar[UserManager] = UserManager()
+    _loaded_email: str | None = None
 
     class Meta(AbstractUser.Meta):  # type: ignore[name-defined,misc]
         swappable = "AUTH_USER_MODEL"
 
     def __str__(self) -> str:
         return self.email
+
+    @classmethod
+    def from_db(
+        cls, db: str | None, field_names: Collection[str], values: Collection[object]
+    ) -> Self:
+        user = super().from_db(db, field_names, values)
+        user._loaded_email = user.__dict__.get("email")  # noqa: SLF001
+        return user
+
+    def save(
+        self,
+        force_insert: bool | tuple[ModelBase, ...] = False,  # noqa: FBT002
+        force_update: bool = False,  # noqa: FBT001, FBT002
+        using: str | None = None,
+        update_fields: Iterable[str] | None = None,
+    ) -> None:
+        super().save(
+            force_insert=force_insert,
+            force_update=force_update,
+            using=using,
+            update_fields=update_fields,
+        )
+        self._loaded_email = self.email
+
+    def cache_keys(self) -> list[str]:
+        emails = {self.email, self._loaded_email} - {None}
+        return [make_key(USER_CACHE, email) for email in emails]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CertificatesConfig(AppConfig):
     name = "django_ca.certificates"
     verbose_name = "Certificates"
+
+    def ready(self) -> None:
+        from django_ca.certificates import signals  # noqa: F401
@@ -0,0 +1,54 @@
+import time
+from typing import cast
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from django_ca.certificates.models import Certificate
+
+
+class Command(BaseCommand):
+    help = "Fill the metadata columns of the certificates issued before they existed"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of certificates to parse and save at once",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="The seconds to wait between batches",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        batch_size = cast(int, options["batch_size"])
+        sleep = cast(float, options["sleep"])
+
+        pending = (
+            Certificate.objects.filter(fingerprint="")
+            .only("id", "certificate")
+            .order_by("id")
+        )
+        filled = 0
+        failed = 0
+        last_id = 0
+        while batch := list(pending.filter(id__gt=last_id)[:batch_size]):
+            last_id = batch[-1].id
+            parsed = []
+            for certificate in batch:
+                try:
+                    certificate.set_metadata()
+                except ValueError as exc:
+                    failed += 1
+                    self.stderr.write(f"Certificate {certificate.id}: {exc}")
+                else:
+                    parsed.append(certificate)
+            Certificate.objects.bulk_update(parsed, Certificate.metadata_fields)
+            filled += len(parsed)
+            self.stdout.write(f"Filled {filled} certificates up to id {last_id}")
+            if sleep:
+                time.sleep(sleep)
+        self.stdout.write(f"Filled {filled} certificates, {failed} failed")
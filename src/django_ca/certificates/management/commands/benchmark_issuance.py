@@ -0,0 +1,92 @@
+from typing import TYPE_CHECKING, cast
+
+from pyutilkit.timing import Stopwatch
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from django_ca.certificates.utils import (
+    CAMaterialCache,
+    KeyAlgorithm,
+    generate_certificate,
+    generate_csr,
+    generate_key,
+    generate_self_signed_certificate,
+    sign_csr,
+)
+
+if TYPE_CHECKING:
+    from django_ca.certificates.types import SubjectInfo
+
+
+class Command(BaseCommand):
+    help = "Compare issuing a server certificate with and without a CSR round trip"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=100,
+            help="The number of certificates to issue with each method",
+        )
+        parser.add_argument(
+            "--algorithm",
+            choices=KeyAlgorithm.values,
+            default=settings.KEY_ALGORITHM,
+            help="The algorithm of the CA and the server keys",
+        )
+        parser.add_argument(
+            "--names",
+            type=int,
+            default=5,
+            help="The number of alternative names of each certificate",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        iterations = cast(int, options["iterations"])
+        names = cast(int, options["names"])
+        algorithm = KeyAlgorithm(cast(str, options["algorithm"]))
+
+        subject: SubjectInfo = {
+            "country": settings.DEFAULT_COUNTRY,
+            "province": settings.DEFAULT_PROVINCE,
+            "locality": settings.DEFAULT_LOCALITY,
+            "organisation": settings.SERVER_NAME,
+            "email_address": settings.SERVER_EMAIL,
+        }
+        ca_key = generate_key(algorithm)
+        ca_cert = generate_self_signed_certificate(
+            **subject, common_name=settings.CA_NAME, private_key=ca_key
+        )
+        ca_material = CAMaterialCache().get(ca_cert, ca_key)
+        private_key = generate_key(algorithm)
+        alternative_names = [f"host-{index}.example.com" for index in range(names)]
+
+        csr_round_trip = Stopwatch()
+        direct = Stopwatch()
+        for _ in range(iterations):
+            with csr_round_trip:
+                csr = generate_csr(
+                    **subject,
+                    common_name="benchmark",
+                    alternative_names=alternative_names,
+                    private_key=private_key,
+                    trusted_key=True,
+                )
+                sign_csr(csr, ca_material)
+            with direct:
+                generate_certificate(
+                    **subject,
+                    common_name="benchmark",
+                    alternative_names=alternative_names,
+                    private_key=private_key,
+                    ca_material=ca_material,
+                    trusted_key=True,
+                )
+
+        saving = csr_round_trip.average.nanoseconds - direct.average.nanoseconds
+        self.stdout.write(f"CSR round trip: {csr_round_trip.average} per certificate")
+        self.stdout.write(f"Direct issuance: {direct.average} per certificate")
+        self.stdout.write(
+            f"Saving: {saving / csr_round_trip.average.nanoseconds:.1%} per certificate"
+        )
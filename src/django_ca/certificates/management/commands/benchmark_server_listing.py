@@ -0,0 +1,113 @@
+from collections.abc import Callable
+from typing import cast
+from uuid import uuid4
+
+from pyutilkit.timing import Stopwatch
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from django_ca.accounts.models import User
+from django_ca.certificates.models import Certificate, Key, Server, ServerName
+
+
+class Command(BaseCommand):
+    help = "Compare the fan-out and the aggregated queries of the server listing"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--servers",
+            type=int,
+            default=10_000,
+            help="The number of servers of the benchmark user",
+        )
+        parser.add_argument(
+            "--names",
+            type=int,
+            default=50,
+            help="The number of alternative names of each server",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="The number of times to build the listing with each query",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        servers = cast(int, options["servers"])
+        names = cast(int, options["names"])
+        iterations = cast(int, options["iterations"])
+
+        with transaction.atomic():
+            user = self.create_user(servers, names)
+            fan_out, fan_out_queries = self.measure(self.fan_out, user, iterations)
+            aggregated, aggregated_queries = self.measure(
+                self.aggregated, user, iterations
+            )
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"Fan-out: {fan_out.average} per listing, {fan_out_queries} queries"
+        )
+        self.stdout.write(
+            f"Aggregated: {aggregated.average} per listing, "
+            f"{aggregated_queries} queries"
+        )
+
+    @staticmethod
+    def create_user(servers: int, names: int) -> User:
+        user = User.objects.create_user(email=f"benchmark-{uuid4().hex}@example.com")
+        created = Server.objects.bulk_create(
+            [
+                Server(
+                    user=user,
+                    organisation=user.default_organisation,
+                    common_name=uuid4().hex,
+                )
+                for _ in range(servers)
+            ]
+        )
+        ServerName.objects.bulk_create(
+            [
+                ServerName(server=server, name=f"host-{index}.example.com")
+                for server in created
+                for index in range(names)
+            ],
+            batch_size=10_000,
+        )
+        Key.objects.bulk_create(
+            [Key(server=server, private_key=b"benchmark") for server in created]
+        )
+        Certificate.objects.bulk_create(
+            [Certificate(server=server, certificate=b"benchmark") for server in created]
+        )
+        return user
+
+    @staticmethod
+    def measure(
+        build: Callable[[User], int], user: User, iterations: int
+    ) -> tuple[Stopwatch, int]:
+        stopwatch = Stopwatch()
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as queries, stopwatch:
+                build(user)
+        return stopwatch, len(queries)
+
+    @staticmethod
+    def fan_out(user: User) -> int:
+        servers_info: dict[tuple[int, int], list[str]] = {}
+        for server in Server.objects.filter(user=user).values(
+            "alternative_names__name", "key__id", "certificate__id"
+        ):
+            servers_info.setdefault((server["key__id"], server["certificate__id"]), [])
+            servers_info[server["key__id"], server["certificate__id"]].append(
+                server["alternative_names__name"]
+            )
+        Certificate.objects.filter(self_signed=True).first()
+        return len(servers_info)
+
+    @staticmethod
+    def aggregated(user: User) -> int:
+        return len(list(Server.objects.get_listing(user)))
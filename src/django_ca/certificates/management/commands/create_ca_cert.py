@@ -1,17 +1,39 @@
-from django.core.management.base import BaseCommand
+from typing import cast
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
 
 from django_ca.accounts.models import User
 from django_ca.certificates.models import Certificate, Key, Server
+from django_ca.certificates.utils import (
+    KeyAlgorithm,
+    generate_key_object,
+    serialize_private_key,
+)
 
 
 class Command(BaseCommand):
     help = "Create a CA Certificate"
 
-    def handle(self, *_args: object, **_options: object) -> None:
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--algorithm",
+            choices=KeyAlgorithm.values,
+            default=settings.CA_KEY_ALGORITHM,
+            help="The algorithm of the CA key",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
         if Certificate.objects.filter(self_signed=True).exists():
             self.stdout.write("CA certificate already exists")
             return
         ca = User.objects.get(is_ca=True)
         server, _ = Server.objects.get_or_create_for_ca(ca)
-        key, _ = Key.objects.get_or_create_server_key(server)
+        if not Key.objects.filter(server=server).exists():
+            algorithm = KeyAlgorithm(cast(str, options["algorithm"]))
+            Key.objects.create(
+                server=server,
+                algorithm=algorithm,
+                private_key=serialize_private_key(generate_key_object(algorithm)),
+            )
         Certificate.objects.get_or_create_server_cert(server, self_signed=True)
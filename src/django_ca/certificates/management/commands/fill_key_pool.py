@@ -0,0 +1,122 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+from typing import cast
+
+from pyutilkit.date_utils import now
+from pyutilkit.timing import Stopwatch
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from django_ca.certificates.models import PooledKey
+from django_ca.certificates.utils import KeyAlgorithm, generate_key
+from django_ca.lib.executors import process_pool
+
+
+class Command(BaseCommand):
+    help = "Fill the pool of pre-generated private keys"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=settings.KEY_POOL_SIZE,
+            help="The number of spare keys to keep in the pool",
+        )
+        parser.add_argument(
+            "--algorithm",
+            choices=KeyAlgorithm.values,
+            default=settings.KEY_ALGORITHM,
+            help="The algorithm of the keys in the pool",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="The number of processes generating keys",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="The number of keys to save in a single query",
+        )
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep refilling the pool every `--interval` seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=settings.KEY_POOL_REFILL_INTERVAL,
+            help="The seconds to wait between two refills in daemon mode",
+        )
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            help="Print the pool statistics and exit",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        size = cast(int, options["size"])
+        algorithm = KeyAlgorithm(cast(str, options["algorithm"]))
+        workers = cast(int, options["workers"])
+        batch_size = cast(int, options["batch_size"])
+        interval = cast(int, options["interval"])
+
+        if options["status"]:
+            self.print_status(algorithm)
+            return
+
+        with process_pool(workers) as executor:
+            while True:
+                self.fill(executor, algorithm, size, batch_size)
+                PooledKey.objects.purge_claimed(now() - timedelta(days=1))
+                if not options["daemon"]:
+                    break
+                time.sleep(interval)
+
+    def fill(
+        self,
+        executor: ProcessPoolExecutor,
+        algorithm: KeyAlgorithm,
+        size: int,
+        batch_size: int,
+    ) -> None:
+        missing = size - PooledKey.objects.available(algorithm).count()
+        if missing <= 0:
+            return
+
+        futures = [
+            executor.submit(
+                generate_key,
+                algorithm,
+                key_size=settings.RSA_KEY_SIZE,
+                public_exponent=settings.RSA_PUBLIC_EXPONENT,
+            )
+            for _ in range(missing)
+        ]
+        batch: list[PooledKey] = []
+        with Stopwatch() as stopwatch:
+            for future in as_completed(futures):
+                batch.append(
+                    PooledKey(algorithm=algorithm, private_key=future.result())
+                )
+                if len(batch) >= batch_size:
+                    PooledKey.objects.bulk_create(batch)
+                    batch = []
+            PooledKey.objects.bulk_create(batch)
+
+        rate = missing / (stopwatch.elapsed.nanoseconds / 10**9)
+        self.stdout.write(
+            f"Added {missing} {algorithm.label} keys in {stopwatch.elapsed} ({rate:.2f} keys/s)"
+        )
+
+    def print_status(self, algorithm: KeyAlgorithm) -> None:
+        stats = PooledKey.objects.get_stats(algorithm)
+        self.stdout.write(f"{algorithm.label} pool depth: {stats.depth}/{stats.target}")
+        self.stdout.write(f"Refilled in the last {stats.window}: {stats.refilled}")
+        self.stdout.write(f"Consumed in the last {stats.window}: {stats.consumed}")
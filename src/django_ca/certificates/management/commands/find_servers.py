@@ -0,0 +1,56 @@
+from typing import cast
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from django_ca.certificates.models import ServerName
+
+
+class Command(BaseCommand):
+    help = "Find the servers whose alternative names match a hostname or a domain"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("query", help="A hostname, a wildcard or a domain")
+        parser.add_argument(
+            "--mode",
+            choices=["exact", "covering", "wildcard", "under"],
+            default="covering",
+            help=(
+                "exact: the name itself, covering: the name and the wildcard covering "
+                "it, wildcard: the names matching *.domain, under: every name that "
+                "ends with the domain"
+            ),
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="The maximum number of names to show",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        query = cast(str, options["query"])
+        mode = cast(str, options["mode"])
+        limit = cast(int, options["limit"])
+
+        names = ServerName.objects.all()
+        match mode:
+            case "exact":
+                names = names.exact(query)
+            case "wildcard":
+                names = names.wildcard(query)
+            case "under":
+                names = names.under(query)
+            case _:
+                names = names.covering(query)
+        names = names.select_related("server__certificate").order_by("name", "id")
+
+        count = 0
+        for server_name in names[:limit]:
+            count += 1
+            certificate = getattr(server_name.server, "certificate", None)
+            certificate_id = "-" if certificate is None else certificate.id
+            self.stdout.write(
+                f"{server_name.name}\tserver {server_name.server_id}\t"
+                f"certificate {certificate_id}"
+            )
+        self.stdout.write(f"Found {count} names")
@@ -0,0 +1,26 @@
+from typing import cast
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from django_ca.certificates.models import CertificateRevocationList
+
+
+class Command(BaseCommand):
+    help = "Generate a base CRL, or a delta CRL against the latest base CRL"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--delta",
+            action="store_true",
+            help="Only include the revocations made since the latest base CRL",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        try:
+            if cast(bool, options["delta"]):
+                crl = CertificateRevocationList.objects.generate_delta()
+            else:
+                crl = CertificateRevocationList.objects.generate_base()
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(f"Generated {crl}")
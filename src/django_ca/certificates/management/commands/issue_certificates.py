@@ -0,0 +1,299 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import batched
+from pathlib import Path
+from typing import cast
+
+from pyutilkit.timing import Stopwatch
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from django_ca.accounts.models import User
+from django_ca.certificates.models import Certificate, Key, Server, ServerName
+from django_ca.certificates.signals import certificates_issued
+from django_ca.certificates.utils import KeyAlgorithm, issue_server_certificate
+from django_ca.lib.executors import process_pool
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestRow:
+    line: int
+    email: str
+    alternative_names: list[str]
+    key_algorithm: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class InvalidRow:
+    line: int
+    error: str
+
+
+@dataclass(frozen=True, slots=True)
+class PendingRow:
+    row: ManifestRow
+    server: Server
+    algorithm: KeyAlgorithm
+    future: Future[tuple[bytes, bytes]]
+
+
+class Command(BaseCommand):
+    help = "Issue server certificates in bulk from a CSV or JSONL manifest"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "manifest",
+            type=Path,
+            help=(
+                "A CSV file with `email`, space separated `alternative_names` and "
+                "optional `key_algorithm` columns, or a JSONL file with the same keys"
+            ),
+        )
+        parser.add_argument(
+            "--errors",
+            type=Path,
+            default=None,
+            help="A JSONL file to write the rows that failed to",
+        )
+        parser.add_argument(
+            "--algorithm",
+            choices=KeyAlgorithm.values,
+            default=settings.KEY_ALGORITHM,
+            help="The key algorithm of the rows that do not specify one",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="The number of processes generating keys and certificates",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="The number of certificates to save in a single transaction",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        manifest = cast(Path, options["manifest"])
+        errors_path = cast(Path | None, options["errors"])
+        workers = cast(int, options["workers"])
+        batch_size = cast(int, options["batch_size"])
+        self.algorithm = KeyAlgorithm(cast(str, options["algorithm"]))
+
+        try:
+            self.ca_cert = Certificate.objects.select_related("server__key").get(
+                self_signed=True
+            )
+        except Certificate.DoesNotExist as exc:
+            msg = "There is no CA certificate to sign with"
+            raise CommandError(msg) from exc
+
+        self.seen: set[str] = set()
+        self.errors: list[tuple[int, str]] = []
+        self.processed = 0
+        self.issued = 0
+        self.started = time.perf_counter()
+        pending: deque[list[PendingRow]] = deque()
+        with Stopwatch() as stopwatch, process_pool(workers) as executor:
+            for rows in batched(self.read_manifest(manifest), batch_size, strict=False):
+                pending.append(self.submit(executor, list(rows)))
+                if len(pending) > 1:
+                    self.save(pending.popleft())
+            while pending:
+                self.save(pending.popleft())
+
+        if errors_path is not None:
+            with errors_path.open("w") as file:
+                for line, error in self.errors:
+                    file.write(json.dumps({"line": line, "error": error}) + "\n")
+        self.stdout.write(
+            f"Issued {self.issued} certificates, {len(self.errors)} rows failed "
+            f"in {stopwatch.elapsed}"
+        )
+
+    @classmethod
+    def read_manifest(cls, path: Path) -> Iterator[ManifestRow | InvalidRow]:
+        with path.open() as file:
+            if path.suffix == ".csv":
+                for line, record in enumerate(csv.DictReader(file), start=2):
+                    names = record.get("alternative_names")
+                    yield cls.parse_record(
+                        line,
+                        {
+                            "email": record.get("email"),
+                            "alternative_names": names.split() if names else [],
+                            "key_algorithm": record.get("key_algorithm"),
+                        },
+                    )
+            elif path.suffix == ".jsonl":
+                for line, raw_record in enumerate(file, start=1):
+                    if not raw_record.strip():
+                        continue
+                    try:
+                        record = json.loads(raw_record)
+                    except json.JSONDecodeError:
+                        yield InvalidRow(line=line, error="The row is not valid JSON")
+                    else:
+                        yield cls.parse_record(line, record)
+            else:
+                msg = "The manifest must be a .csv or a .jsonl file"
+                raise CommandError(msg)
+
+    @staticmethod
+    def parse_record(line: int, record: object) -> ManifestRow | InvalidRow:
+        if not isinstance(record, dict):
+            return InvalidRow(line=line, error="The row is not an object")
+        email = record.get("email")
+        alternative_names = record.get("alternative_names")
+        key_algorithm = record.get("key_algorithm")
+        if not isinstance(email, str):
+            return InvalidRow(line=line, error="The email must be a string")
+        if not isinstance(alternative_names, list) or not all(
+            isinstance(name, str) for name in alternative_names
+        ):
+            return InvalidRow(
+                line=line, error="The alternative names must be a list of strings"
+            )
+        if not alternative_names:
+            return InvalidRow(line=line, error="There are no alternative names")
+        if key_algorithm is not None and not isinstance(key_algorithm, str):
+            return InvalidRow(line=line, error="The key algorithm must be a string")
+        return ManifestRow(
+            line=line,
+            email=email.strip(),
+            alternative_names=alternative_names,
+            key_algorithm=key_algorithm or None,
+        )
+
+    def submit(
+        self, executor: ProcessPoolExecutor, records: list[ManifestRow | InvalidRow]
+    ) -> list[PendingRow]:
+        rows = []
+        for record in records:
+            if isinstance(record, InvalidRow):
+                self.errors.append((record.line, record.error))
+            else:
+                rows.append(record)
+        users = {
+            user.email: user
+            for user in User.objects.select_related("default_organisation").filter(
+                email__in={row.email for row in rows}, is_ca=False
+            )
+        }
+        candidates: dict[str, tuple[ManifestRow, User]] = {}
+        for row in rows:
+            if row.email not in users:
+                self.errors.append(
+                    (row.line, f"There is no user with email {row.email}")
+                )
+            elif row.key_algorithm not in {None, *KeyAlgorithm.values}:
+                self.errors.append(
+                    (row.line, f"Unknown key algorithm {row.key_algorithm}")
+                )
+            else:
+                common_name = Server.objects.get_common_name(
+                    users[row.email], row.alternative_names
+                )
+                if common_name in self.seen or common_name in candidates:
+                    self.errors.append((row.line, "Duplicate server in the manifest"))
+                else:
+                    candidates[common_name] = (row, users[row.email])
+        existing = set(
+            Server.objects.filter(common_name__in=candidates).flat_values("common_name")
+        )
+
+        pending = []
+        for common_name, (row, user) in candidates.items():
+            self.seen.add(common_name)
+            if common_name in existing:
+                self.errors.append((row.line, "The server already exists"))
+                continue
+            organisation = user.default_organisation
+            algorithm = KeyAlgorithm(row.key_algorithm or self.algorithm)
+            future = executor.submit(
+                issue_server_certificate,
+                country=organisation.country,
+                province=organisation.province,
+                locality=organisation.locality,
+                organisation=organisation.name,
+                common_name=common_name,
+                email_address=organisation.email,
+                alternative_names=Server.objects.normalize_names(row.alternative_names),
+                ca_cert=self.ca_cert.certificate,
+                private_ca_key=self.ca_cert.server.key.private_key,
+                key_algorithm=algorithm,
+            )
+            server = Server(
+                user=user, organisation=organisation, common_name=common_name
+            )
+            pending.append(
+                PendingRow(row=row, server=server, algorithm=algorithm, future=future)
+            )
+        self.processed += len(records)
+        return pending
+
+    def save(self, pending: list[PendingRow]) -> None:
+        issued: list[tuple[PendingRow, tuple[bytes, bytes]]] = []
+        for pending_row in pending:
+            try:
+                issued.append((pending_row, pending_row.future.result()))
+            except Exception as exc:  # noqa: BLE001
+                self.errors.append((pending_row.row.line, str(exc)))
+
+        try:
+            with transaction.atomic():
+                servers = Server.objects.bulk_create(
+                    [pending_row.server for pending_row, _ in issued]
+                )
+                ServerName.objects.bulk_create(
+                    [
+                        ServerName(server=server, name=name)
+                        for server, (pending_row, _) in zip(
+                            servers, issued, strict=True
+                        )
+                        for name in Server.objects.normalize_names(
+                            pending_row.row.alternative_names
+                        )
+                    ]
+                )
+                Key.objects.bulk_create(
+                    [
+                        Key(
+                            server=server,
+                            algorithm=pending_row.algorithm,
+                            private_key=private_key,
+                        )
+                        for server, (pending_row, (private_key, _)) in zip(
+                            servers, issued, strict=True
+                        )
+                    ]
+                )
+                certificates = [
+                    Certificate(server=server, certificate=der)
+                    for server, (_, (_, der)) in zip(servers, issued, strict=True)
+                ]
+                for certificate in certificates:
+                    certificate.set_metadata()
+                Certificate.objects.bulk_create(certificates)
+        except Exception as exc:  # noqa: BLE001
+            self.errors.extend(
+                (pending_row.row.line, str(exc)) for pending_row, _ in issued
+            )
+        else:
+            self.issued += len(issued)
+            certificates_issued.send(sender=Certificate, certificates=certificates)
+
+        seconds = time.perf_counter() - self.started
+        self.stdout.write(
+            f"Processed {self.processed} rows: {self.issued} issued, "
+            f"{len(self.errors)} failed ({self.issued / seconds:.2f} certificates/s)"
+        )
@@ -0,0 +1,181 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import cast
+
+from pyutilkit.date_utils import now
+from pyutilkit.timing import Stopwatch
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import close_old_connections, transaction
+
+from django_ca.certificates.models import Certificate, Revocation
+from django_ca.certificates.signals import certificates_renewed
+from django_ca.certificates.utils import renew_server_certificate
+from django_ca.lib.executors import process_pool
+
+type PendingBatch = list[tuple[Certificate, Future[bytes]]]
+
+
+class Command(BaseCommand):
+    help = "Renew the server certificates that are about to expire"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--within-days",
+            type=int,
+            default=settings.RENEWAL_WINDOW.days,
+            help="Renew the certificates that expire within this many days",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="The number of certificates to renew in a single transaction",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="The number of processes signing the renewed certificates",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=0,
+            help="The maximum certificates to renew per second, 0 for no limit",
+        )
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep renewing the expiring certificates every interval",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=3600,
+            help="The seconds between scans in daemon mode",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        window = timedelta(days=cast(int, options["within_days"]))
+        batch_size = cast(int, options["batch_size"])
+        workers = cast(int, options["workers"])
+        self.rate = cast(float, options["rate"])
+        daemon = cast(bool, options["daemon"])
+        interval = cast(int, options["interval"])
+
+        with process_pool(workers) as executor:
+            while True:
+                with Stopwatch() as stopwatch:
+                    renewed, failed = self.renew(executor, now() + window, batch_size)
+                self.stdout.write(
+                    f"Renewed {renewed} certificates, {failed} failed "
+                    f"in {stopwatch.elapsed}"
+                )
+                if not daemon:
+                    break
+                close_old_connections()
+                time.sleep(interval)
+
+    def renew(
+        self, executor: ProcessPoolExecutor, before: datetime, batch_size: int
+    ) -> tuple[int, int]:
+        try:
+            ca_cert = Certificate.objects.select_related("server__key").get(
+                self_signed=True
+            )
+        except Certificate.DoesNotExist as exc:
+            msg = "There is no CA certificate to sign with"
+            raise CommandError(msg) from exc
+
+        expiring = (
+            Certificate.objects.expiring(before)
+            .select_related("server__organisation", "server__key", "revocation")
+            .order_by("id")
+        )
+        self.renewed = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        submitted = 0
+        last_id = 0
+        pending: deque[PendingBatch] = deque()
+        while batch := list(expiring.filter(id__gt=last_id)[:batch_size]):
+            last_id = batch[-1].id
+            self.throttle(submitted)
+            pending.append(
+                [
+                    (certificate, self.submit(executor, certificate, ca_cert))
+                    for certificate in batch
+                ]
+            )
+            submitted += len(batch)
+            if len(pending) > 1:
+                self.save(pending.popleft())
+        while pending:
+            self.save(pending.popleft())
+        return self.renewed, self.failed
+
+    def throttle(self, submitted: int) -> None:
+        if self.rate <= 0:
+            return
+        delay = self.started + submitted / self.rate - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def submit(
+        executor: ProcessPoolExecutor, certificate: Certificate, ca_cert: Certificate
+    ) -> Future[bytes]:
+        server = certificate.server
+        organisation = server.organisation
+        return executor.submit(
+            renew_server_certificate,
+            country=organisation.country,
+            province=organisation.province,
+            locality=organisation.locality,
+            organisation=organisation.name,
+            common_name=server.common_name,
+            email_address=organisation.email,
+            alternative_names=certificate.alternative_names,
+            private_key=server.key.private_key,
+            ca_cert=ca_cert.certificate,
+            private_ca_key=ca_cert.server.key.private_key,
+        )
+
+    def save(self, pending: PendingBatch) -> None:
+        renewed = []
+        for certificate, future in pending:
+            try:
+                certificate.certificate = future.result()
+            except Exception as exc:  # noqa: BLE001
+                self.failed += 1
+                self.stderr.write(f"Certificate {certificate.id}: {exc}")
+                continue
+            certificate.csr = b""
+            certificate.set_metadata()
+            renewed.append(certificate)
+
+        with transaction.atomic():
+            revoked = set(
+                Revocation.objects.filter(certificate__in=renewed).flat_values(
+                    "certificate_id"
+                )
+            )
+            renewed = [
+                certificate for certificate in renewed if certificate.id not in revoked
+            ]
+            Certificate.objects.bulk_update(
+                renewed, ["certificate", "csr", *Certificate.metadata_fields]
+            )
+            certificates_renewed.send(sender=Certificate, certificates=renewed)
+        self.renewed += len(renewed)
+
+        seconds = time.monotonic() - self.started
+        self.stdout.write(
+            f"Renewed {self.renewed} certificates, {self.failed} failed "
+            f"({self.renewed / seconds:.2f} certificates/s)"
+        )
@@ -0,0 +1,34 @@
+from typing import cast
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from django_ca.certificates.models import Certificate, Revocation
+from django_ca.certificates.utils import RevocationReason
+
+
+class Command(BaseCommand):
+    help = "Revoke a server certificate"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("certificate_id", type=int, help="The certificate id")
+        parser.add_argument(
+            "--reason",
+            choices=RevocationReason.values,
+            default=RevocationReason.UNSPECIFIED,
+            help="The reason of the revocation",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        try:
+            certificate = Certificate.objects.get(
+                id=cast(int, options["certificate_id"])
+            )
+            revocation, created = Revocation.objects.revoke(
+                certificate, cast(str, options["reason"])
+            )
+        except (Certificate.DoesNotExist, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        if created:
+            self.stdout.write(f"Revoked {revocation.serial_number}")
+        else:
+            self.stdout.write(f"{revocation.serial_number} was already revoked")
@@ -0,0 +1,56 @@
+import time
+from datetime import timedelta
+from typing import cast
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from django_ca.certificates.models import IssuanceJob, JobStatus
+
+
+class Command(BaseCommand):
+    help = "Claim and run pending issuance jobs"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=settings.ISSUANCE_JOB_TIMEOUT,
+            help="The seconds after which a running job can be claimed again",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1,
+            help="The seconds to wait when there are no jobs to claim",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit when there are no jobs to claim",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        timeout = timedelta(seconds=cast(int, options["timeout"]))
+        poll_interval = cast(float, options["poll_interval"])
+        burst = cast(bool, options["burst"])
+
+        processed = 0
+        while True:
+            job = IssuanceJob.objects.claim(timeout)
+            if job is None:
+                if burst:
+                    break
+                close_old_connections()
+                time.sleep(poll_interval)
+                continue
+            job.run()
+            job.refresh_from_db(fields=["status", "error"])
+            processed += 1
+            message = f"Job {job.oid}: {job.status} after {job.attempts} attempts"
+            if job.status == JobStatus.DONE:
+                self.stdout.write(message)
+            else:
+                self.stderr.write(f"{message}: {job.error}")
+        self.stdout.write(f"Processed {processed} jobs")
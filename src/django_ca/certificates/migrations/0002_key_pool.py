@@ -0,0 +1,50 @@
+import pyutilkit.date_utils
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("certificates", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PooledKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=pyutilkit.date_utils.now, editable=False
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        default=pyutilkit.date_utils.now, editable=False
+                    ),
+                ),
+                ("private_key", models.CharField(blank=True, max_length=3272)),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("claimed_at__isnull", True)),
+                        fields=["id"],
+                        name="available_pooled_key",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("certificates", "0002_key_pool"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="certificate",
+            name="csr",
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("certificates", "0003_optional_csr"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="pooledkey",
+            name="available_pooled_key",
+        ),
+        migrations.AddField(
+            model_name="key",
+            name="algorithm",
+            field=models.CharField(
+                choices=[
+                    ("rsa", "RSA"),
+                    ("ecdsa-p256", "ECDSA P-256"),
+                    ("ecdsa-p384", "ECDSA P-384"),
+                    ("ed25519", "Ed25519"),
+                ],
+                default="rsa",
+                max_length=15,
+            ),
+        ),
+        migrations.AddField(
+            model_name="pooledkey",
+            name="algorithm",
+            field=models.CharField(
+                choices=[
+                    ("rsa", "RSA"),
+                    ("ecdsa-p256", "ECDSA P-256"),
+                    ("ecdsa-p384", "ECDSA P-384"),
+                    ("ed25519", "Ed25519"),
+                ],
+                default="rsa",
+                max_length=15,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="key",
+            name="private_key",
+            field=models.TextField(),
+        ),
+        migrations.AlterField(
+            model_name="pooledkey",
+            name="private_key",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddIndex(
+            model_name="pooledkey",
+            index=models.Index(
+                condition=models.Q(("claimed_at__isnull", True)),
+                fields=["algorithm", "id"],
+                name="available_pooled_key",
+            ),
+        ),
+    ]
@@ -0,0 +1,110 @@
+import pyutilkit.date_utils
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("certificates", "0005_issuance_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CertificateRevocationList",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=pyutilkit.date_utils.now, editable=False
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        default=pyutilkit.date_utils.now, editable=False
+                    ),
+                ),
+                ("number", models.PositiveIntegerField(unique=True)),
+                ("base_number", models.PositiveIntegerField(blank=True, null=True)),
+                ("this_update", models.DateTimeField()),
+                ("next_update", models.DateTimeField()),
+                ("der", models.BinaryField()),
+                ("pem", models.TextField()),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="Revocation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=pyutilkit.date_utils.now, editable=False
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        default=pyutilkit.date_utils.now, editable=False
+                    ),
+                ),
+                ("serial_number", models.CharField(max_length=40, unique=True)),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[
+                            ("unspecified", "Unspecified"),
+                            ("keyCompromise", "Key compromise"),
+                            ("cACompromise", "CA compromise"),
+                            ("affiliationChanged", "Affiliation changed"),
+                            ("superseded", "Superseded"),
+                            ("cessationOfOperation", "Cessation of operation"),
+                            ("certificateHold", "Certificate hold"),
+                            ("privilegeWithdrawn", "Privilege withdrawn"),
+                        ],
+                        default="unspecified",
+                        max_length=22,
+                    ),
+                ),
+                (
+                    "revoked_at",
+                    models.DateTimeField(
+                        db_index=True, default=pyutilkit.date_utils.now
+                    ),
+                ),
+                (
+                    "certificate",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="revocation",
+                        to="certificates.certificate",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
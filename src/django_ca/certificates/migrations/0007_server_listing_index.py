@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("certificates", "0006_revocations"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="server",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="server_listing"
+            ),
+        ),
+    ]
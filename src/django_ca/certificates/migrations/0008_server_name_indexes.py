@@ -0,0 +1,27 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("certificates", "0007_server_listing_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="servername",
+            index=models.Index(fields=["name"], name="server_name"),
+        ),
+        migrations.AddIndex(
+            model_name="servername",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Reverse("name"),
+                    name="text_pattern_ops",
+                ),
+                name="reversed_server_name",
+            ),
+        ),
+    ]
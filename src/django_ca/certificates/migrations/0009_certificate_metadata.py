@@ -0,0 +1,54 @@
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("certificates", "0008_server_name_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="certificate",
+            name="alternative_names",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=2047),
+                blank=True,
+                default=list,
+                size=None,
+            ),
+        ),
+        migrations.AddField(
+            model_name="certificate",
+            name="fingerprint",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="certificate",
+            name="issuer",
+            field=models.CharField(blank=True, max_length=2047),
+        ),
+        migrations.AddField(
+            model_name="certificate",
+            name="not_valid_after",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="certificate",
+            name="not_valid_before",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="certificate",
+            name="serial_number",
+            field=models.CharField(blank=True, db_index=True, max_length=40),
+        ),
+        migrations.AddIndex(
+            model_name="certificate",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["alternative_names"], name="certificate_names"
+            ),
+        ),
+    ]
@@ -0,0 +1,153 @@
+import base64
+from collections.abc import Callable
+
+from django.apps.registry import Apps
+from django.db import migrations, models, transaction
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+BATCH_SIZE = 500
+FIELDS = {
+    "certificate": {
+        "certificate": "CERTIFICATE",
+        "csr": "CERTIFICATE REQUEST",
+    },
+    "key": {"private_key": "PRIVATE KEY"},
+    "pooledkey": {"private_key": "PRIVATE KEY"},
+}
+
+
+def pem_to_der(pem: str, _label: str) -> bytes:
+    return base64.b64decode(
+        "".join(line for line in pem.splitlines() if not line.startswith("-----"))
+    )
+
+
+def der_to_pem(der: bytes, label: str) -> str:
+    if not der:
+        return ""
+    body = base64.b64encode(der).decode()
+    return "".join(
+        [
+            f"-----BEGIN {label}-----\n",
+            *(f"{body[start : start + 64]}\n" for start in range(0, len(body), 64)),
+            f"-----END {label}-----\n",
+        ]
+    )
+
+
+def convert(
+    apps: Apps, source_suffix: str, target_suffix: str, func: Callable[..., object]
+) -> None:
+    for model_name, fields in FIELDS.items():
+        model = apps.get_model("certificates", model_name)
+        sources = [f"{field}{source_suffix}" for field in fields]
+        targets = [f"{field}{target_suffix}" for field in fields]
+        last_id = 0
+        while batch := list(
+            model.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", *sources)[:BATCH_SIZE]
+        ):
+            last_id = batch[-1][0]
+            with transaction.atomic():
+                model.objects.bulk_update(
+                    [
+                        model(
+                            id=row[0],
+                            **{
+                                target: func(value, label)
+                                for target, value, label in zip(
+                                    targets, row[1:], fields.values(), strict=True
+                                )
+                            },
+                        )
+                        for row in batch
+                    ],
+                    targets,
+                )
+
+
+def encode(apps: Apps, _schema_editor: BaseDatabaseSchemaEditor) -> None:
+    convert(apps, "", "_der", pem_to_der)
+
+
+def decode(apps: Apps, _schema_editor: BaseDatabaseSchemaEditor) -> None:
+    convert(apps, "_der", "", lambda der, label: der_to_pem(bytes(der), label))
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("certificates", "0009_certificate_metadata"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="certificate",
+            name="certificate_der",
+            field=models.BinaryField(default=b""),
+        ),
+        migrations.AddField(
+            model_name="certificate",
+            name="csr_der",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AddField(
+            model_name="key",
+            name="private_key_der",
+            field=models.BinaryField(default=b""),
+        ),
+        migrations.AddField(
+            model_name="pooledkey",
+            name="private_key_der",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.RunPython(encode, decode),
+        migrations.AlterField(
+            model_name="certificate",
+            name="certificate",
+            field=models.TextField(default=""),
+        ),
+        migrations.AlterField(
+            model_name="key",
+            name="private_key",
+            field=models.TextField(default=""),
+        ),
+        migrations.RemoveField(model_name="certificate", name="certificate"),
+        migrations.RemoveField(model_name="certificate", name="csr"),
+        migrations.RemoveField(model_name="key", name="private_key"),
+        migrations.RemoveField(model_name="pooledkey", name="private_key"),
+        migrations.RenameField(
+            model_name="certificate", old_name="certificate_der", new_name="certificate"
+        ),
+        migrations.RenameField(
+            model_name="certificate", old_name="csr_der", new_name="csr"
+        ),
+        migrations.RenameField(
+            model_name="key", old_name="private_key_der", new_name="private_key"
+        ),
+        migrations.RenameField(
+            model_name="pooledkey", old_name="private_key_der", new_name="private_key"
+        ),
+        migrations.AlterField(
+            model_name="certificate",
+            name="certificate",
+            field=models.BinaryField(),
+        ),
+        migrations.AlterField(
+            model_name="certificate",
+            name="csr",
+            field=models.BinaryField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name="key",
+            name="private_key",
+            field=models.BinaryField(),
+        ),
+        migrations.AlterField(
+            model_name="pooledkey",
+            name="private_key",
+            field=models.BinaryField(blank=True),
+        ),
+    ]
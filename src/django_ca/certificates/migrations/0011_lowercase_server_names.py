@@ -0,0 +1,32 @@
+from django.db import migrations
+
+DEDUPLICATE = """
+DELETE FROM certificates_servername
+WHERE id IN (
+    SELECT id FROM (
+        SELECT
+            id,
+            row_number() OVER (
+                PARTITION BY server_id, lower(name)
+                ORDER BY name = lower(name) DESC, id
+            ) AS position
+        FROM certificates_servername
+    ) AS ranked
+    WHERE position > 1
+)
+"""
+LOWERCASE = """
+UPDATE certificates_servername SET name = lower(name) WHERE name <> lower(name)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("certificates", "0010_der_storage"),
+    ]
+
+    operations = [
+        migrations.RunSQL(DEDUPLICATE, migrations.RunSQL.noop),
+        migrations.RunSQL(LOWERCASE, migrations.RunSQL.noop),
+    ]
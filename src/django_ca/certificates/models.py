@@ -1,26 +1,104 @@
 from __future__ import annotations
 
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from hashlib import sha256
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar, Self
+
+from cryptography.hazmat.primitives import serialization
+from pyutilkit.date_utils import now
 
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.aggregates import ArrayAgg, StringAgg
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import connections, models, transaction
+from django.db.models.functions import Coalesce, Reverse
 
 from django_ca.accounts.models import Organisation, User
 from django_ca.certificates.utils import (
+    CAMaterial,
+    KeyAlgorithm,
+    RevocationReason,
+    RevokedSerial,
+    build_crl,
+    ca_materials,
+    generate_certificate,
     generate_csr,
-    generate_rsa_key,
+    generate_key,
     generate_self_signed_certificate,
-    sign_csr,
+    get_certificate_metadata,
+    get_serial_number,
 )
+from django_ca.lib.cache import aget_or_set, make_key
+from django_ca.lib.db import advisory_lock
+from django_ca.lib.metrics import Counter
 from django_ca.lib.models import BaseModel, BaseQuerySet
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from django_ca.certificates.types import ServerInfo
+
+CERTIFICATE_CACHE = "certificate"
+CRL_LOCK = 0x63726C
+
+certificates_issued = Counter(
+    "dj_ca_certificates_issued_total", "The certificates issued", ("kind",)
+)
+keys_issued = Counter(
+    "dj_ca_keys_issued_total", "The private keys issued to servers", ("source",)
+)
+
+
+class ServerNameQuerySet(BaseQuerySet["ServerName"]):
+    def exact(self, hostname: str) -> Self:
+        return self.filter(name=hostname.lower())
 
-class ServerNameManager(models.Manager.from_queryset(BaseQuerySet["ServerName"])):  # type: ignore[misc]
+    def covering(self, hostname: str) -> Self:
+        hostname = hostname.lower()
+        _, _, parent = hostname.partition(".")
+        return self.filter(name__in=[hostname, f"*.{parent}"])
+
+    def under(self, domain: str) -> Self:
+        domain = domain.lower().removeprefix("*.")
+        return self.alias(reversed_name=Reverse("name")).filter(
+            models.Q(name=domain)
+            | models.Q(reversed_name__startswith=f".{domain}"[::-1])
+        )
+
+    def wildcard(self, pattern: str) -> Self:
+        suffix = pattern.lower().removeprefix("*")
+        return (
+            self.alias(reversed_name=Reverse("name"))
+            .filter(reversed_name__startswith=suffix[::-1])
+            .filter(name__regex=rf"^[^.]+{re.escape(suffix)}$")
+        )
+
+
+class ServerNameManager(models.Manager.from_queryset(ServerNameQuerySet)):  # type: ignore[misc]
     pass
 
 
-class ServerManager(models.Manager.from_queryset(BaseQuerySet["Server"])):  # type: ignore[misc]
+class ServerQuerySet(BaseQuerySet["Server"]):
+    def with_display_names(self) -> Self:
+        names = (
+            ServerName.objects.filter(server=models.OuterRef("pk"))
+            .values("server")
+            .annotate(names=StringAgg("name", ", ", ordering="name"))
+            .values("names")
+        )
+        return self.annotate(
+            display_name=Coalesce(
+                models.Subquery(names),
+                models.F("common_name"),
+                output_field=models.TextField(),
+            )
+        )
+
+
+class ServerManager(models.Manager.from_queryset(ServerQuerySet)):  # type: ignore[misc]
     def get_or_create_for_ca(self, ca: User) -> tuple[Server, bool]:
         try:
             server = self.get(user=ca)
@@ -35,44 +113,191 @@ class ServerManager(models.Manager.from_queryset(BaseQuerySet["Server"])):  # ty
             created = False
         return server, created
 
+    @staticmethod
+    def normalize_names(alternative_names: Iterable[str]) -> list[str]:
+        return sorted({name.lower() for name in alternative_names})
+
+    def get_common_name(self, user: User, alternative_names: list[str]) -> str:
+        return sha256(
+            "".join([user.email, *self.normalize_names(alternative_names)]).encode()
+        ).hexdigest()
+
     def get_or_create_for_alt_names(
         self, user: User, alternative_names: list[str]
     ) -> tuple[Server, bool]:
         if user.is_ca:
             return self.get_or_create_for_ca(user)
-        alternative_names = sorted(set(alternative_names))
-        common_name = sha256(
-            "".join([user.email, *alternative_names]).encode()
-        ).hexdigest()
+        alternative_names = self.normalize_names(alternative_names)
+        common_name = self.get_common_name(user, alternative_names)
         try:
-            server = self.get(common_name=common_name)
+            return self.get(common_name=common_name), False
         except Server.DoesNotExist:
-            server = self.create(
-                user=user,
-                organisation=user.default_organisation,
-                common_name=common_name,
+            pass
+        candidate = Server(
+            user=user, organisation=user.default_organisation, common_name=common_name
+        )
+        with transaction.atomic(using=self.db):
+            server_id = self._insert_if_absent(candidate)
+            if server_id is None:
+                return self.get(common_name=common_name), False
+            candidate.id = server_id
+            candidate._state.adding = False  # noqa: SLF001
+            candidate._state.db = self.db  # noqa: SLF001
+            ServerName.objects.bulk_create(
+                [
+                    ServerName(server=candidate, name=alternative_name)
+                    for alternative_name in alternative_names
+                ],
+                ignore_conflicts=True,
             )
-            created = True
-            for alternative_name in alternative_names:
-                ServerName.objects.create(server=server, name=alternative_name)
-        else:
-            created = False
-        return server, created
+        return candidate, True
+
+    def _insert_if_absent(self, candidate: Server) -> int | None:
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)  # noqa: SLF001
+        candidate.created_at = candidate.updated_at = now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} "  # noqa: S608
+                "(user_id, organisation_id, common_name, created_at, updated_at) "
+                "VALUES (%s, %s, %s, %s, %s) "
+                "ON CONFLICT (common_name) DO NOTHING RETURNING id",
+                [
+                    candidate.user_id,
+                    candidate.organisation_id,
+                    candidate.common_name,
+                    candidate.created_at,
+                    candidate.updated_at,
+                ],
+            )
+            row = cursor.fetchone()
+        return None if row is None else row[0]
+
+    def get_listing(self, user: User) -> models.QuerySet[Server, ServerInfo]:
+        listing: models.QuerySet[Server, ServerInfo] = (
+            self.filter(user=user)
+            .values(
+                "id",
+                "created_at",
+                key_id=models.F("key__id"),
+                cert_id=models.F("certificate__id"),
+            )
+            .annotate(
+                names=ArrayAgg(
+                    "alternative_names__name",
+                    filter=models.Q(alternative_names__isnull=False),
+                    ordering="alternative_names__name",
+                    default=[],
+                )
+            )
+            .order_by("created_at", "id")
+        )
+        return listing
+
+    def issue_for_alt_names(
+        self,
+        user: User,
+        alternative_names: list[str],
+        algorithm: str | None = None,
+    ) -> tuple[Server, Key, Certificate]:
+        server, _ = self.get_or_create_for_alt_names(user, alternative_names)
+        key, _ = Key.objects.get_or_create_server_key(server, algorithm)
+        certificate, _ = Certificate.objects.get_or_create_server_cert(server)
+        return server, key, certificate
+
+
+@dataclass(frozen=True, slots=True)
+class KeyPoolStats:
+    algorithm: KeyAlgorithm
+    depth: int
+    target: int
+    refilled: int
+    consumed: int
+    window: timedelta
 
 
-class KeyManager(models.Manager.from_queryset(BaseQuerySet["Key"])):  # type: ignore[misc]
-    def get_or_create_server_key(self, server: Server) -> tuple[Key, bool]:
+class PooledKeyManager(models.Manager.from_queryset(BaseQuerySet["PooledKey"])):  # type: ignore[misc]
+    def available(self, algorithm: KeyAlgorithm) -> BaseQuerySet[PooledKey]:
+        queryset: BaseQuerySet[PooledKey] = self.filter(
+            algorithm=algorithm, claimed_at__isnull=True
+        )
+        return queryset
+
+    def pop(self, algorithm: KeyAlgorithm) -> bytes | None:
+        with transaction.atomic():
+            pooled_key = (
+                self.available(algorithm)
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .first()
+            )
+            if pooled_key is None:
+                return None
+            private_key = bytes(pooled_key.private_key)
+            pooled_key.private_key = b""
+            pooled_key.claimed_at = now()
+            pooled_key.save(update_fields=["private_key", "claimed_at", "updated_at"])
+        return private_key
+
+    def purge_claimed(self, before: datetime) -> int:
+        deleted: int
+        deleted, _ = self.filter(claimed_at__lt=before).delete()
+        return deleted
+
+    def get_stats(
+        self, algorithm: KeyAlgorithm, window: timedelta = timedelta(hours=1)
+    ) -> KeyPoolStats:
+        since = now() - window
+        queryset = self.filter(algorithm=algorithm)
+        return KeyPoolStats(
+            algorithm=algorithm,
+            depth=self.available(algorithm).count(),
+            target=settings.KEY_POOL_SIZE,
+            refilled=queryset.filter(created_at__gte=since).count(),
+            consumed=queryset.filter(claimed_at__gte=since).count(),
+            window=window,
+        )
+
+
+class KeyQuerySet(BaseQuerySet["Key"]):
+    def with_display_names(self) -> Self:
+        return self.select_related("server")
+
+
+class KeyManager(models.Manager.from_queryset(KeyQuerySet)):  # type: ignore[misc]
+    def get_or_create_server_key(
+        self, server: Server, algorithm: str | None = None
+    ) -> tuple[Key, bool]:
         try:
             key = self.get(server=server)
         except Key.DoesNotExist:
-            key = self.create(server=server, private_key=generate_rsa_key())
+            algorithm = KeyAlgorithm(algorithm or settings.KEY_ALGORITHM)
+            private_key = PooledKey.objects.pop(algorithm)
+            source = "pool"
+            if private_key is None:
+                private_key = generate_key(algorithm)
+                source = "generated"
+            key = self.create(
+                server=server, algorithm=algorithm, private_key=private_key
+            )
+            keys_issued.inc(source=source)
             created = True
         else:
             created = False
         return key, created
 
 
-class CertificateManager(models.Manager.from_queryset(BaseQuerySet["Certificate"])):  # type: ignore[misc]
+class CertificateQuerySet(BaseQuerySet["Certificate"]):
+    def with_display_names(self) -> Self:
+        return self.select_related("server")
+
+    def expiring(self, before: datetime) -> Self:
+        return self.filter(
+            self_signed=False, revocation__isnull=True, not_valid_after__lt=before
+        )
+
+
+class CertificateManager(models.Manager.from_queryset(CertificateQuerySet)):  # type: ignore[misc]
     def get_or_create_server_cert(
         self, server: Server, *, self_signed: bool = False
     ) -> tuple[Certificate, bool]:
@@ -80,20 +305,22 @@ class CertificateManager(models.Manager.from_queryset(BaseQuerySet["Certificate"
             key = self.get(server=server)
         except Certificate.DoesNotExist:
             info = self._get_cert_info(server, self_signed=self_signed)
-            key = self.create(
+            key = self.model(
                 server=server,
                 self_signed=self_signed,
                 csr=info["csr"],
                 certificate=info["certificate"],
             )
+            key.set_metadata()
+            key.save(force_insert=True, using=self.db)
+            certificates_issued.inc(kind="ca" if self_signed else "server")
             created = True
         else:
             created = False
         return key, created
 
-    def _get_cert_info(self, server: Server, *, self_signed: bool) -> dict[str, str]:
+    def _get_cert_info(self, server: Server, *, self_signed: bool) -> dict[str, bytes]:
         if self_signed:
-            csr = ""
             certificate = generate_self_signed_certificate(
                 country=server.organisation.country,
                 province=server.organisation.province,
@@ -102,10 +329,10 @@ class CertificateManager(models.Manager.from_queryset(BaseQuerySet["Certificate"
                 common_name=settings.CA_NAME,
                 email_address=server.organisation.email,
                 private_key=server.key.private_key,
+                trusted_key=True,
             )
-            return {"csr": "", "certificate": certificate}
-        ca_cert = self.get(self_signed=True)
-        csr = generate_csr(
+            return {"csr": b"", "certificate": certificate}
+        certificate = generate_certificate(
             country=server.organisation.country,
             province=server.organisation.province,
             locality=server.organisation.locality,
@@ -114,9 +341,187 @@ class CertificateManager(models.Manager.from_queryset(BaseQuerySet["Certificate"
             email_address=server.organisation.email,
             alternative_names=server.alternative_names.flat_values("name"),
             private_key=server.key.private_key,
+            ca_material=self.get_ca_material(),
+            trusted_key=True,
+        )
+        return {"csr": b"", "certificate": certificate}
+
+    def get_ca_material(self) -> CAMaterial:
+        material = ca_materials.get_recent()
+        if material is not None:
+            return material
+        if ca_materials.active is not None:
+            # another process may have rotated the CA since it was loaded
+            version = (
+                self.filter(self_signed=True)
+                .values_list("updated_at", "server__key__updated_at")
+                .get()
+            )
+            material = ca_materials.confirm(version)
+            if material is not None:
+                return material
+        ca_cert = self.select_related("server__key").get(self_signed=True)
+        return ca_materials.activate(
+            ca_cert.server_id,
+            ca_cert.certificate,
+            ca_cert.server.key.private_key,
+            (ca_cert.updated_at, ca_cert.server.key.updated_at),
+        )
+
+    async def aget_ca_certificate(self) -> Certificate | None:
+        return await aget_or_set(
+            CERTIFICATE_CACHE,
+            "ca",
+            self.filter(self_signed=True)
+            .only("self_signed", "certificate", "updated_at")
+            .afirst,
+        )
+
+    async def aget_ca_certificate_id(self) -> int:
+        certificate_id = ca_materials.get_certificate_id()
+        if certificate_id is None:
+            certificate_id = (
+                await self.filter(self_signed=True).values_list("id", flat=True).aget()
+            )
+            ca_materials.set_certificate_id(certificate_id)
+        return certificate_id
+
+
+class RevocationManager(models.Manager.from_queryset(BaseQuerySet["Revocation"])):  # type: ignore[misc]
+    def revoke(
+        self,
+        certificate: Certificate,
+        reason: str = RevocationReason.UNSPECIFIED,
+    ) -> tuple[Revocation, bool]:
+        if certificate.self_signed:
+            msg = "The CA certificate cannot be revoked"
+            raise ValueError(msg)
+        revocation: Revocation
+        with transaction.atomic(using=self.db):
+            # a CRL that is being built must not miss a revocation committed after
+            advisory_lock(CRL_LOCK, shared=True, using=self.db)
+            revocation, created = self.get_or_create(
+                certificate=certificate,
+                defaults={
+                    "serial_number": certificate.serial_number
+                    or get_serial_number(certificate.certificate),
+                    "reason": reason,
+                },
+            )
+        return revocation, created
+
+    def get_revoked_serials(
+        self, since: datetime | None = None
+    ) -> Iterator[RevokedSerial]:
+        revocations = (
+            self.all() if since is None else self.filter(revoked_at__gte=since)
+        )
+        for serial_number, revoked_at, reason in revocations.values_list(
+            "serial_number", "revoked_at", "reason"
+        ).iterator(chunk_size=settings.CRL_CHUNK_SIZE):
+            yield RevokedSerial(
+                serial_number=serial_number, revoked_at=revoked_at, reason=reason
+            )
+
+
+class CertificateRevocationListManager(
+    models.Manager.from_queryset(BaseQuerySet["CertificateRevocationList"])  # type: ignore[misc]
+):
+    def get_latest(self, *, delta: bool = False) -> CertificateRevocationList | None:
+        crl: CertificateRevocationList | None = (
+            self.filter(base_number__isnull=not delta).order_by("-number").first()
+        )
+        return crl
+
+    def generate_base(self) -> CertificateRevocationList:
+        this_update = now()
+        return self._generate(
+            Revocation.objects.get_revoked_serials(),
+            this_update=this_update,
+            next_update=this_update + settings.CRL_VALIDITY_PERIOD,
+        )
+
+    def generate_delta(self) -> CertificateRevocationList:
+        base = self.get_latest()
+        if base is None:
+            msg = "A base CRL must be generated before a delta CRL"
+            raise ValueError(msg)
+        this_update = now()
+        return self._generate(
+            Revocation.objects.get_revoked_serials(since=base.this_update),
+            this_update=this_update,
+            next_update=this_update + settings.DELTA_CRL_VALIDITY_PERIOD,
+            base_number=base.number,
+        )
+
+    def _generate(
+        self,
+        revocations: Iterable[RevokedSerial],
+        this_update: datetime,
+        next_update: datetime,
+        base_number: int | None = None,
+    ) -> CertificateRevocationList:
+        with transaction.atomic(using=self.db):
+            advisory_lock(CRL_LOCK, using=self.db)
+            latest = self.only("number").order_by("-number").first()
+            number = 1 if latest is None else latest.number + 1
+            crl = build_crl(
+                revocations,
+                Certificate.objects.get_ca_material(),
+                number=number,
+                this_update=this_update,
+                next_update=next_update,
+                base_number=base_number,
+            )
+            created: CertificateRevocationList = self.create(
+                number=number,
+                base_number=base_number,
+                this_update=this_update,
+                next_update=next_update,
+                der=crl.public_bytes(serialization.Encoding.DER),
+                pem=crl.public_bytes(serialization.Encoding.PEM).decode(),
+            )
+        return created
+
+
+class JobStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    FAILED = "failed", "Failed"
+
+
+class IssuanceJobManager(models.Manager.from_queryset(BaseQuerySet["IssuanceJob"])):  # type: ignore[misc]
+    async def aenqueue(
+        self, user: User, alternative_names: list[str], algorithm: str | None = None
+    ) -> IssuanceJob:
+        job: IssuanceJob = await self.acreate(
+            user=user,
+            alternative_names=sorted(set(alternative_names)),
+            key_algorithm=algorithm or "",
+            max_attempts=settings.ISSUANCE_JOB_MAX_ATTEMPTS,
         )
-        certificate = sign_csr(csr, ca_cert.certificate, ca_cert.server.key.private_key)
-        return {"csr": csr, "certificate": certificate}
+        return job
+
+    def claim(self, timeout: timedelta) -> IssuanceJob | None:
+        current_time = now()
+        with transaction.atomic():
+            job: IssuanceJob | None = (
+                self.filter(
+                    models.Q(status=JobStatus.PENDING, run_after__lte=current_time)
+                    | models.Q(status=JobStatus.RUNNING, locked_until__lt=current_time)
+                )
+                .select_for_update(skip_locked=True)
+                .order_by("run_after", "id")
+                .first()
+            )
+            if job is None:
+                return None
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            job.locked_until = current_time + timeout
+            job.save(update_fields=["status", "attempts", "locked_until", "updated_at"])
+        return job
 
 
 class Server(BaseModel):
@@ -128,13 +533,21 @@ class Server(BaseModel):
     )
     common_name = models.CharField(max_length=2047, unique=True)
 
+    display_name: str | None = None
+
     objects: ClassVar[ServerManager] = ServerManager()
 
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["user", "created_at", "id"], name="server_listing")
+        ]
+
     def __str__(self) -> str:
-        alternative_names = self.alternative_names.flat_values("name")
-        if alternative_names.exists():
-            return ", ".join(alternative_names)
-        return self.common_name
+        if self.display_name is None:
+            self.display_name = ", ".join(
+                sorted(server_name.name for server_name in self.alternative_names.all())
+            )
+        return self.display_name or self.common_name
 
 
 class ServerName(BaseModel):
@@ -143,7 +556,7 @@ class ServerName(BaseModel):
     )
     name = models.CharField(max_length=2047)
 
-    objects: ClassVar[ServerManager] = ServerManager()
+    objects: ClassVar[ServerNameManager] = ServerNameManager()
 
     class Meta:
         constraints: ClassVar[list[models.BaseConstraint]] = [
@@ -151,6 +564,13 @@ class ServerName(BaseModel):
                 fields=["server", "name"], name="unique_server_name"
             )
         ]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["name"], name="server_name"),
+            models.Index(
+                OpClass(Reverse("name"), name="text_pattern_ops"),
+                name="reversed_server_name",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -158,7 +578,10 @@ class ServerName(BaseModel):
 
 class Key(BaseModel):
     server = models.OneToOneField(Server, on_delete=models.CASCADE)
-    private_key = models.CharField(max_length=3272)
+    algorithm = models.CharField(
+        max_length=15, choices=KeyAlgorithm.choices, default=KeyAlgorithm.RSA
+    )
+    private_key = models.BinaryField()
 
     objects: ClassVar[KeyManager] = KeyManager()
 
@@ -166,13 +589,200 @@ class Key(BaseModel):
         return self.server.common_name
 
 
+class PooledKey(BaseModel):
+    algorithm = models.CharField(
+        max_length=15, choices=KeyAlgorithm.choices, default=KeyAlgorithm.RSA
+    )
+    private_key = models.BinaryField(blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    objects: ClassVar[PooledKeyManager] = PooledKeyManager()
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["algorithm", "id"],
+                condition=models.Q(claimed_at__isnull=True),
+                name="available_pooled_key",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"Pooled key #{self.id}"
+
+
 class Certificate(BaseModel):
     server = models.OneToOneField(Server, on_delete=models.CASCADE)
     self_signed = models.BooleanField(default=False)
-    csr = models.TextField()
-    certificate = models.TextField()
+    csr = models.BinaryField(blank=True)
+    certificate = models.BinaryField()
+    serial_number = models.CharField(max_length=40, blank=True, db_index=True)
+    not_valid_before = models.DateTimeField(null=True, blank=True)
+    not_valid_after = models.DateTimeField(null=True, blank=True, db_index=True)
+    fingerprint = models.CharField(max_length=64, blank=True, db_index=True)
+    issuer = models.CharField(max_length=2047, blank=True)
+    alternative_names = ArrayField(
+        models.CharField(max_length=2047), default=list, blank=True
+    )
 
     objects: ClassVar[CertificateManager] = CertificateManager()
 
+    metadata_fields: ClassVar[list[str]] = [
+        "serial_number",
+        "not_valid_before",
+        "not_valid_after",
+        "fingerprint",
+        "issuer",
+        "alternative_names",
+    ]
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            GinIndex(fields=["alternative_names"], name="certificate_names")
+        ]
+
     def __str__(self) -> str:
         return self.server.common_name
+
+    def set_metadata(self) -> None:
+        metadata = get_certificate_metadata(self.certificate)
+        self.serial_number = metadata.serial_number
+        self.not_valid_before = metadata.not_valid_before
+        self.not_valid_after = metadata.not_valid_after
+        self.fingerprint = metadata.fingerprint
+        self.issuer = metadata.issuer
+        self.alternative_names = metadata.alternative_names
+
+    def cache_keys(self) -> list[str]:
+        return [make_key(CERTIFICATE_CACHE, "ca")] if self.self_signed else []
+
+    def get_csr(self) -> bytes:
+        if self.csr or self.self_signed:
+            return bytes(self.csr)
+        organisation = self.server.organisation
+        csr = generate_csr(
+            country=organisation.country,
+            province=organisation.province,
+            locality=organisation.locality,
+            organisation=organisation.name,
+            common_name=self.server.common_name,
+            email_address=organisation.email,
+            alternative_names=self.server.alternative_names.flat_values("name"),
+            private_key=self.server.key.private_key,
+            trusted_key=True,
+        )
+        self.csr = csr
+        # the CSR is derived data, so storing it must not touch the ETag
+        Certificate.objects.filter(id=self.id).update(
+            csr=csr, updated_at=models.F("updated_at")
+        )
+        return csr
+
+
+class Revocation(BaseModel):
+    certificate = models.OneToOneField(
+        Certificate, on_delete=models.CASCADE, related_name="revocation"
+    )
+    serial_number = models.CharField(max_length=40, unique=True)
+    reason = models.CharField(
+        max_length=22,
+        choices=RevocationReason.choices,
+        default=RevocationReason.UNSPECIFIED,
+    )
+    revoked_at = models.DateTimeField(default=now, db_index=True)
+
+    objects: ClassVar[RevocationManager] = RevocationManager()
+
+    def __str__(self) -> str:
+        return f"Revocation of {self.serial_number}"
+
+    @property
+    def revoked_serial(self) -> RevokedSerial:
+        return RevokedSerial(
+            serial_number=self.serial_number,
+            revoked_at=self.revoked_at,
+            reason=self.reason,
+        )
+
+
+class CertificateRevocationList(BaseModel):
+    number = models.PositiveIntegerField(unique=True)
+    base_number = models.PositiveIntegerField(null=True, blank=True)
+    this_update = models.DateTimeField()
+    next_update = models.DateTimeField()
+    der = models.BinaryField()
+    pem = models.TextField()
+
+    objects: ClassVar[CertificateRevocationListManager] = (
+        CertificateRevocationListManager()
+    )
+
+    def __str__(self) -> str:
+        kind = "Base" if self.base_number is None else "Delta"
+        return f"{kind} CRL #{self.number}"
+
+
+class IssuanceJob(BaseModel):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="issuance_jobs"
+    )
+    alternative_names = ArrayField(models.CharField(max_length=2047))
+    key_algorithm = models.CharField(
+        max_length=15, choices=KeyAlgorithm.choices, blank=True
+    )
+    status = models.CharField(
+        max_length=7, choices=JobStatus.choices, default=JobStatus.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField()
+    run_after = models.DateTimeField(default=now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    server = models.ForeignKey(
+        Server,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="issuance_jobs",
+    )
+
+    objects: ClassVar[IssuanceJobManager] = IssuanceJobManager()
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["run_after", "id"],
+                condition=models.Q(status__in=[JobStatus.PENDING, JobStatus.RUNNING]),
+                name="claimable_issuance_job",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"Issuance job #{self.id} ({self.status})"
+
+    def run(self) -> None:
+        if self.attempts > self.max_attempts:
+            self._finish(status=JobStatus.FAILED, error="The job timed out")
+            return
+        try:
+            server, _, _ = Server.objects.issue_for_alt_names(
+                self.user, self.alternative_names, self.key_algorithm or None
+            )
+        except Exception as exc:  # noqa: BLE001
+            if self.attempts >= self.max_attempts:
+                self._finish(status=JobStatus.FAILED, error=str(exc))
+            else:
+                delay = settings.ISSUANCE_JOB_RETRY_DELAY * 2 ** (self.attempts - 1)
+                self._finish(
+                    status=JobStatus.PENDING,
+                    error=str(exc),
+                    run_after=now() + timedelta(seconds=delay),
+                )
+        else:
+            self._finish(status=JobStatus.DONE, error="", server=server)
+
+    def _finish(self, **fields: object) -> None:
+        # a worker that outlived its lease must not overwrite the new owner's state
+        IssuanceJob.objects.filter(
+            id=self.id, status=JobStatus.RUNNING, locked_until=self.locked_until
+        ).update(locked_until=None, **fields)
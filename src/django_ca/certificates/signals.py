@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from django_ca.certificates.models import Certificate, Key
+from django_ca.certificates.utils import ca_materials
+
+certificates_issued = Signal()
+certificates_renewed = Signal()
+
+
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def clear_ca_certificate(instance: Certificate, **_kwargs: object) -> None:
+    if instance.self_signed:
+        ca_materials.clear()
+
+
+@receiver(post_save, sender=Key)
+@receiver(post_delete, sender=Key)
+def clear_ca_key(instance: Key, **_kwargs: object) -> None:
+    if instance.server_id == ca_materials.active_server_id:
+        ca_materials.clear()
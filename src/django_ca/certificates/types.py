@@ -1,6 +1,18 @@
+from datetime import datetime
 from typing import TypedDict
 
 
 class ServerInfo(TypedDict):
+    id: int
+    created_at: datetime
+    key_id: int | None
+    cert_id: int | None
     names: list[str]
-    count: int
+
+
+class SubjectInfo(TypedDict):
+    country: str
+    province: str
+    locality: str
+    organisation: str
+    email_address: str
@@ -6,6 +6,32 @@ app_name = "certificates"
 urlpatterns = [
     path("", views.CertificateHomeView.as_view(), name="home"),
     path("server/", views.UserServerView.as_view(), name="server"),
+    path("server/issue/", views.IssueServerView.as_view(), name="issue"),
+    path("server/list/", views.ServerListView.as_view(), name="list"),
+    path("server/bundle/", views.ServerBundleView.as_view(), name="bundle"),
+    path("server/jobs/", views.IssuanceJobView.as_view(), name="jobs"),
+    path(
+        "server/jobs/<int:job_id>/",
+        views.IssuanceJobStatusView.as_view(),
+        name="job_status",
+    ),
+    path("crl/", views.CertificateRevocationListView.as_view(), name="crl"),
+    path(
+        "crl/pem/",
+        views.CertificateRevocationListView.as_view(pem=True),
+        name="crl_pem",
+    ),
+    path(
+        "crl/delta/",
+        views.CertificateRevocationListView.as_view(delta=True),
+        name="delta_crl",
+    ),
+    path(
+        "crl/delta/pem/",
+        views.CertificateRevocationListView.as_view(delta=True, pem=True),
+        name="delta_crl_pem",
+    ),
+    path("executor/", views.CryptoExecutorStatusView.as_view(), name="executor_status"),
     path(
         "key/<int:obj_id>/<field>/<filename>/",
         views.DownloadKeyView.as_view(),
@@ -1,37 +1,295 @@
+import base64
+import math
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from hashlib import sha256
+
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric.rsa import (
-    RSAPrivateKey,
-    generate_private_key,
-)
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.asymmetric.types import CertificatePublicKeyTypes
 from cryptography.x509.oid import NameOID
 from pyutilkit.date_utils import now
 
 from django.conf import settings
+from django.db import models
+
+from django_ca.lib.metrics import Histogram
+
+PrivateKey = rsa.RSAPrivateKey | ec.EllipticCurvePrivateKey | ed25519.Ed25519PrivateKey
+
+
+class KeyAlgorithm(models.TextChoices):
+    RSA = "rsa", "RSA"
+    ECDSA_P256 = "ecdsa-p256", "ECDSA P-256"
+    ECDSA_P384 = "ecdsa-p384", "ECDSA P-384"
+    ED25519 = "ed25519", "Ed25519"
+
+
+class RevocationReason(models.TextChoices):
+    UNSPECIFIED = x509.ReasonFlags.unspecified.value, "Unspecified"
+    KEY_COMPROMISE = x509.ReasonFlags.key_compromise.value, "Key compromise"
+    CA_COMPROMISE = x509.ReasonFlags.ca_compromise.value, "CA compromise"
+    AFFILIATION_CHANGED = (
+        x509.ReasonFlags.affiliation_changed.value,
+        "Affiliation changed",
+    )
+    SUPERSEDED = x509.ReasonFlags.superseded.value, "Superseded"
+    CESSATION_OF_OPERATION = (
+        x509.ReasonFlags.cessation_of_operation.value,
+        "Cessation of operation",
+    )
+    CERTIFICATE_HOLD = x509.ReasonFlags.certificate_hold.value, "Certificate hold"
+    PRIVILEGE_WITHDRAWN = (
+        x509.ReasonFlags.privilege_withdrawn.value,
+        "Privilege withdrawn",
+    )
+
+
+class PEMLabel(StrEnum):
+    CERTIFICATE = "CERTIFICATE"
+    CSR = "CERTIFICATE REQUEST"
+    PRIVATE_KEY = "PRIVATE KEY"
+
 
+@dataclass(frozen=True, slots=True)
+class CertificateMetadata:
+    serial_number: str
+    not_valid_before: datetime
+    not_valid_after: datetime
+    fingerprint: str
+    issuer: str
+    alternative_names: list[str]
 
-def _get_key_object(private_key: str) -> RSAPrivateKey:
-    key_object = serialization.load_pem_private_key(private_key.encode(), password=None)
-    if isinstance(key_object, RSAPrivateKey):
+
+@dataclass(frozen=True, slots=True)
+class RevokedSerial:
+    serial_number: str
+    revoked_at: datetime
+    reason: str
+
+
+crypto_seconds = Histogram(
+    "dj_ca_crypto_seconds", "The time spent in cryptographic operations", ("operation",)
+)
+
+
+def _get_key_object(private_key: bytes, *, trusted: bool = False) -> PrivateKey:
+    # RSA validation is only skipped for keys this CA generated and stored itself
+    key_object = serialization.load_der_private_key(
+        private_key, password=None, unsafe_skip_rsa_key_validation=trusted
+    )
+    if isinstance(
+        key_object,
+        rsa.RSAPrivateKey | ec.EllipticCurvePrivateKey | ed25519.Ed25519PrivateKey,
+    ):
         return key_object
-    msg = "Only RSA private keys are allowed"
+    msg = "Only RSA, ECDSA and Ed25519 private keys are allowed"
     raise TypeError(msg)
 
 
-def generate_rsa_key() -> str:
-    return (
-        generate_private_key(
-            public_exponent=settings.RSA_PUBLIC_EXPONENT, key_size=settings.RSA_KEY_SIZE
+def get_hash_algorithm(
+    key_object: PrivateKey,
+) -> hashes.SHA256 | hashes.SHA384 | None:
+    if isinstance(key_object, ed25519.Ed25519PrivateKey):
+        return None
+    if isinstance(key_object, ec.EllipticCurvePrivateKey) and isinstance(
+        key_object.curve, ec.SECP384R1
+    ):
+        return hashes.SHA384()
+    return hashes.SHA256()
+
+
+@dataclass(frozen=True, slots=True)
+class CAMaterial:
+    fingerprint: str
+    certificate: x509.Certificate
+    private_key: PrivateKey
+
+
+class CAMaterialCache:
+    def __init__(self) -> None:
+        self._materials: dict[str, CAMaterial] = {}
+        self.active: CAMaterial | None = None
+        self.active_server_id: int | None = None
+        self.active_version: tuple[datetime, datetime] | None = None
+        self.certificate_id: int | None = None
+        self._checked_at = -math.inf
+        self._certificate_id_checked_at = -math.inf
+
+    @staticmethod
+    def _is_recent(checked_at: float) -> bool:
+        return (
+            time.monotonic() - checked_at
+            < settings.CA_MATERIAL_CHECK_PERIOD.total_seconds()
         )
-        .private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption(),
+
+    def get(self, ca_cert: bytes, private_ca_key: bytes) -> CAMaterial:
+        fingerprint = sha256(ca_cert + private_ca_key).hexdigest()
+        try:
+            return self._materials[fingerprint]
+        except KeyError:
+            material = CAMaterial(
+                fingerprint=fingerprint,
+                certificate=x509.load_der_x509_certificate(ca_cert),
+                private_key=_get_key_object(private_ca_key, trusted=True),
+            )
+            self._materials[fingerprint] = material
+            return material
+
+    def get_recent(self) -> CAMaterial | None:
+        return self.active if self._is_recent(self._checked_at) else None
+
+    def confirm(self, version: tuple[datetime, datetime]) -> CAMaterial | None:
+        if self.active is None or version != self.active_version:
+            return None
+        self._checked_at = time.monotonic()
+        return self.active
+
+    def activate(
+        self,
+        server_id: int,
+        ca_cert: bytes,
+        private_ca_key: bytes,
+        version: tuple[datetime, datetime],
+    ) -> CAMaterial:
+        self.active = self.get(ca_cert, private_ca_key)
+        self.active_server_id = server_id
+        self.active_version = version
+        self._checked_at = time.monotonic()
+        return self.active
+
+    def get_certificate_id(self) -> int | None:
+        if self._is_recent(self._certificate_id_checked_at):
+            return self.certificate_id
+        return None
+
+    def set_certificate_id(self, certificate_id: int) -> None:
+        self.certificate_id = certificate_id
+        self._certificate_id_checked_at = time.monotonic()
+
+    def clear(self) -> None:
+        self._materials.clear()
+        self.active = None
+        self.active_server_id = None
+        self.active_version = None
+        self.certificate_id = None
+        self._checked_at = -math.inf
+        self._certificate_id_checked_at = -math.inf
+
+
+ca_materials = CAMaterialCache()
+
+
+def get_subject_name(
+    country: str,
+    province: str,
+    locality: str,
+    organisation: str,
+    common_name: str,
+    email_address: str,
+) -> x509.Name:
+    return x509.Name(
+        [
+            x509.NameAttribute(NameOID.COUNTRY_NAME, country),
+            x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, province),
+            x509.NameAttribute(NameOID.LOCALITY_NAME, locality),
+            x509.NameAttribute(NameOID.ORGANIZATION_NAME, organisation),
+            x509.NameAttribute(NameOID.COMMON_NAME, common_name),
+            x509.NameAttribute(NameOID.EMAIL_ADDRESS, email_address),
+        ]
+    )
+
+
+def serialize_private_key(key_object: PrivateKey) -> bytes:
+    return key_object.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def serialize_certificate(certificate: x509.Certificate) -> bytes:
+    return certificate.public_bytes(serialization.Encoding.DER)
+
+
+def der_to_pem(der: bytes, label: PEMLabel) -> str:
+    body = base64.b64encode(der).decode()
+    return "".join(
+        [
+            f"-----BEGIN {label}-----\n",
+            *(f"{body[start : start + 64]}\n" for start in range(0, len(body), 64)),
+            f"-----END {label}-----\n",
+        ]
+    )
+
+
+def format_serial_number(serial_number: int) -> str:
+    return f"{serial_number:x}"
+
+
+def get_serial_number(certificate: bytes) -> str:
+    return format_serial_number(
+        x509.load_der_x509_certificate(certificate).serial_number
+    )
+
+
+def get_certificate_metadata(certificate: bytes) -> CertificateMetadata:
+    certificate_object = x509.load_der_x509_certificate(certificate)
+    try:
+        alternative_names = certificate_object.extensions.get_extension_for_class(
+            x509.SubjectAlternativeName
+        ).value.get_values_for_type(x509.DNSName)
+    except x509.ExtensionNotFound:
+        alternative_names = []
+    return CertificateMetadata(
+        serial_number=format_serial_number(certificate_object.serial_number),
+        not_valid_before=certificate_object.not_valid_before_utc,
+        not_valid_after=certificate_object.not_valid_after_utc,
+        fingerprint=certificate_object.fingerprint(hashes.SHA256()).hex(),
+        issuer=certificate_object.issuer.rfc4514_string(),
+        alternative_names=alternative_names,
+    )
+
+
+@crypto_seconds.timed(operation="generate_key")
+def generate_key_object(
+    algorithm: str | None = None,
+    *,
+    key_size: int | None = None,
+    public_exponent: int | None = None,
+) -> PrivateKey:
+    match KeyAlgorithm(algorithm or settings.KEY_ALGORITHM):
+        case KeyAlgorithm.ECDSA_P256:
+            return ec.generate_private_key(ec.SECP256R1())
+        case KeyAlgorithm.ECDSA_P384:
+            return ec.generate_private_key(ec.SECP384R1())
+        case KeyAlgorithm.ED25519:
+            return ed25519.Ed25519PrivateKey.generate()
+        case _:
+            return rsa.generate_private_key(
+                public_exponent=public_exponent or settings.RSA_PUBLIC_EXPONENT,
+                key_size=key_size or settings.RSA_KEY_SIZE,
+            )
+
+
+def generate_key(
+    algorithm: str | None = None,
+    *,
+    key_size: int | None = None,
+    public_exponent: int | None = None,
+) -> bytes:
+    return serialize_private_key(
+        generate_key_object(
+            algorithm, key_size=key_size, public_exponent=public_exponent
         )
-        .decode()
     )
 
 
+@crypto_seconds.timed(operation="generate_csr")
 def generate_csr(
     country: str,
     province: str,
@@ -40,21 +298,16 @@ def generate_csr(
     common_name: str,
     email_address: str,
     alternative_names: list[str],
-    private_key: str,
-) -> str:
-    key_object = _get_key_object(private_key)
+    private_key: bytes,
+    *,
+    trusted_key: bool = False,
+) -> bytes:
+    key_object = _get_key_object(private_key, trusted=trusted_key)
     return (
         x509.CertificateSigningRequestBuilder()
         .subject_name(
-            x509.Name(
-                [
-                    x509.NameAttribute(NameOID.COUNTRY_NAME, country),
-                    x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, province),
-                    x509.NameAttribute(NameOID.LOCALITY_NAME, locality),
-                    x509.NameAttribute(NameOID.ORGANIZATION_NAME, organisation),
-                    x509.NameAttribute(NameOID.COMMON_NAME, common_name),
-                    x509.NameAttribute(NameOID.EMAIL_ADDRESS, email_address),
-                ]
+            get_subject_name(
+                country, province, locality, organisation, common_name, email_address
             )
         )
         .add_extension(
@@ -66,12 +319,12 @@ def generate_csr(
             ),
             critical=False,
         )
-        .sign(key_object, algorithm=hashes.SHA256())
-        .public_bytes(serialization.Encoding.PEM)
-        .decode()
+        .sign(key_object, algorithm=get_hash_algorithm(key_object))
+        .public_bytes(serialization.Encoding.DER)
     )
 
 
+@crypto_seconds.timed(operation="generate_self_signed_certificate")
 def generate_self_signed_certificate(
     country: str,
     province: str,
@@ -79,21 +332,16 @@ def generate_self_signed_certificate(
     organisation: str,
     common_name: str,
     email_address: str,
-    private_key: str,
-) -> str:
-    key_object = _get_key_object(private_key)
-    subject = issuer = x509.Name(
-        [
-            x509.NameAttribute(NameOID.COUNTRY_NAME, country),
-            x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, province),
-            x509.NameAttribute(NameOID.LOCALITY_NAME, locality),
-            x509.NameAttribute(NameOID.ORGANIZATION_NAME, organisation),
-            x509.NameAttribute(NameOID.COMMON_NAME, common_name),
-            x509.NameAttribute(NameOID.EMAIL_ADDRESS, email_address),
-        ]
+    private_key: bytes,
+    *,
+    trusted_key: bool = False,
+) -> bytes:
+    key_object = _get_key_object(private_key, trusted=trusted_key)
+    subject = issuer = get_subject_name(
+        country, province, locality, organisation, common_name, email_address
     )
     start = now()
-    return (
+    return serialize_certificate(
         x509.CertificateBuilder()
         .subject_name(subject)
         .issuer_name(issuer)
@@ -102,35 +350,169 @@ def generate_self_signed_certificate(
         .serial_number(x509.random_serial_number())
         .not_valid_before(start)
         .not_valid_after(start + settings.CA_VALIDITY_PERIOD)
-        .sign(key_object, algorithm=hashes.SHA256())
-        .public_bytes(serialization.Encoding.PEM)
-        .decode()
+        .sign(key_object, algorithm=get_hash_algorithm(key_object))
     )
 
 
-def sign_csr(csr_cert: str, ca_cert: str, private_ca_key: str) -> str:
-    key_object = _get_key_object(private_ca_key)
-    csr_object = x509.load_pem_x509_csr(csr_cert.encode())
-    ca_cert_object = x509.load_pem_x509_certificate(ca_cert.encode())
+def build_server_certificate(
+    public_key: CertificatePublicKeyTypes,
+    subject: x509.Name,
+    alternative_names: Iterable[str],
+    ca_material: CAMaterial,
+) -> x509.Certificate:
     start = now()
     return (
         x509.CertificateBuilder()
-        .subject_name(csr_object.subject)
-        .issuer_name(ca_cert_object.subject)
-        .public_key(csr_object.public_key())
+        .subject_name(subject)
+        .issuer_name(ca_material.certificate.subject)
+        .public_key(public_key)
         .serial_number(x509.random_serial_number())
         .not_valid_before(start)
         .not_valid_after(start + settings.SERVER_VALIDITY_PERIOD)
         .add_extension(
             x509.SubjectAlternativeName(
-                x509.DNSName(alternative_name)
-                for alternative_name in csr_object.extensions.get_extension_for_class(
-                    x509.SubjectAlternativeName
-                ).value.get_values_for_type(x509.DNSName)
+                x509.DNSName(alternative_name) for alternative_name in alternative_names
             ),
             critical=False,
         )
-        .sign(key_object, algorithm=hashes.SHA256())
-        .public_bytes(serialization.Encoding.PEM)
-        .decode()
+        .sign(
+            ca_material.private_key,
+            algorithm=get_hash_algorithm(ca_material.private_key),
+        )
+    )
+
+
+@crypto_seconds.timed(operation="generate_certificate")
+def generate_certificate(
+    country: str,
+    province: str,
+    locality: str,
+    organisation: str,
+    common_name: str,
+    email_address: str,
+    alternative_names: list[str],
+    private_key: bytes,
+    ca_material: CAMaterial,
+    *,
+    trusted_key: bool = False,
+) -> bytes:
+    key_object = _get_key_object(private_key, trusted=trusted_key)
+    subject = get_subject_name(
+        country, province, locality, organisation, common_name, email_address
+    )
+    return serialize_certificate(
+        build_server_certificate(
+            key_object.public_key(), subject, alternative_names, ca_material
+        )
+    )
+
+
+@crypto_seconds.timed(operation="sign_csr")
+def sign_csr(csr_cert: bytes, ca_material: CAMaterial) -> bytes:
+    csr_object = x509.load_der_x509_csr(csr_cert)
+    alternative_names = csr_object.extensions.get_extension_for_class(
+        x509.SubjectAlternativeName
+    ).value.get_values_for_type(x509.DNSName)
+    return serialize_certificate(
+        build_server_certificate(
+            csr_object.public_key(),
+            csr_object.subject,
+            alternative_names,
+            ca_material,
+        )
+    )
+
+
+@crypto_seconds.timed(operation="issue_server_certificate")
+def issue_server_certificate(
+    country: str,
+    province: str,
+    locality: str,
+    organisation: str,
+    common_name: str,
+    email_address: str,
+    alternative_names: list[str],
+    ca_cert: bytes,
+    private_ca_key: bytes,
+    key_algorithm: str | None = None,
+) -> tuple[bytes, bytes]:
+    key_object = generate_key_object(key_algorithm)
+    subject = get_subject_name(
+        country, province, locality, organisation, common_name, email_address
+    )
+    certificate = build_server_certificate(
+        key_object.public_key(),
+        subject,
+        alternative_names,
+        ca_materials.get(ca_cert, private_ca_key),
+    )
+    return serialize_private_key(key_object), serialize_certificate(certificate)
+
+
+def renew_server_certificate(
+    country: str,
+    province: str,
+    locality: str,
+    organisation: str,
+    common_name: str,
+    email_address: str,
+    alternative_names: list[str],
+    private_key: bytes,
+    ca_cert: bytes,
+    private_ca_key: bytes,
+) -> bytes:
+    return generate_certificate(
+        country=country,
+        province=province,
+        locality=locality,
+        organisation=organisation,
+        common_name=common_name,
+        email_address=email_address,
+        alternative_names=alternative_names,
+        private_key=private_key,
+        ca_material=ca_materials.get(ca_cert, private_ca_key),
+        trusted_key=True,
+    )
+
+
+@crypto_seconds.timed(operation="build_crl")
+def build_crl(
+    revocations: Iterable[RevokedSerial],
+    ca_material: CAMaterial,
+    number: int,
+    this_update: datetime,
+    next_update: datetime,
+    base_number: int | None = None,
+) -> x509.CertificateRevocationList:
+    builder = (
+        x509.CertificateRevocationListBuilder()
+        .issuer_name(ca_material.certificate.subject)
+        .last_update(this_update)
+        .next_update(next_update)
+        .add_extension(x509.CRLNumber(number), critical=False)
+        .add_extension(
+            x509.AuthorityKeyIdentifier.from_issuer_public_key(
+                ca_material.private_key.public_key()
+            ),
+            critical=False,
+        )
+    )
+    if base_number is not None:
+        builder = builder.add_extension(
+            x509.DeltaCRLIndicator(base_number), critical=True
+        )
+    for revocation in revocations:
+        revoked = (
+            x509.RevokedCertificateBuilder()
+            .serial_number(int(revocation.serial_number, 16))
+            .revocation_date(revocation.revoked_at)
+        )
+        if revocation.reason != RevocationReason.UNSPECIFIED:
+            revoked = revoked.add_extension(
+                x509.CRLReason(x509.ReasonFlags(revocation.reason)), critical=False
+            )
+        builder = builder.add_revoked_certificate(revoked.build())
+    return builder.sign(
+        ca_material.private_key,
+        algorithm=get_hash_algorithm(ca_material.private_key),
     )
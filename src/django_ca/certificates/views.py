@@ -1,15 +1,43 @@
 from __future__ import annotations
 
+import json
 from typing import TYPE_CHECKING
 
+from pyutilkit.date_utils import now
+
+from django.conf import settings
 from django.contrib.auth.mixins import AccessMixin
-from django.views.generic import TemplateView
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import aget_object_or_404
+from django.utils.http import http_date
+from django.views.generic import TemplateView, View
 
-from django_ca.certificates.models import Certificate, Key, Server
-from django_ca.lib.views import DownloadTextFileView
+from django_ca.accounts.models import User
+from django_ca.certificates.models import (
+    Certificate,
+    CertificateRevocationList,
+    IssuanceJob,
+    JobStatus,
+    Key,
+    Server,
+)
+from django_ca.certificates.utils import KeyAlgorithm, PEMLabel, der_to_pem
+from django_ca.lib.executors import ExecutorFullError, crypto_executor
+from django_ca.lib.pagination import Cursor, Page, apaginate
+from django_ca.lib.utils import TarStream, get_optimus
+from django_ca.lib.views import DownloadTextFileView, ExecutorStatusView
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
     from django_ca.certificates.types import ServerInfo
+    from django_ca.lib.models import BaseModel
     from django_ca.lib.types import JSONDict
 
 
@@ -20,46 +48,274 @@ class CertificateHomeView(TemplateView):
 class UserServerView(AccessMixin, TemplateView):
     template_name = "certificates/certificates.html"
 
-    def get_context_data(self, **kwargs: object) -> JSONDict:
+    async def get(  # type: ignore[override]
+        self, _request: HttpRequest, *_args: object, **kwargs: object
+    ) -> HttpResponse:
+        context = await self.aget_context_data(**kwargs)
+        return self.render_to_response(context)
+
+    async def aget_context_data(self, **kwargs: object) -> JSONDict:
         context = super().get_context_data(**kwargs)
-        context["ca_cert_id"] = Certificate.objects.get(server__user__is_ca=True).id
+        context["ca_cert_id"] = get_optimus().encode(
+            await Certificate.objects.aget_ca_certificate_id()
+        )
 
-        servers_info: dict[tuple[int, int], ServerInfo] = {}
-        for server in Server.objects.filter(user=self.request.user).values(
-            "alternative_names__name", "key__id", "certificate__id"
-        ):
-            key = (server["key__id"], server["certificate__id"])
-            servers_info.setdefault(
-                key,
-                {"names": [], "count": 0},
-            )
-            servers_info[key]["count"] += 1
-            servers_info[key]["names"].append(server["alternative_names__name"])
-        variations = max((info["count"] for info in servers_info.values()), default=0)
+        try:
+            page = await get_server_page(self.request)
+        except ValueError:
+            page = Page(items=[], next_cursor=None)
+        variations = max((len(server["names"]) for server in page.items), default=0)
         context["range"] = list(range(variations))
+        key_oids, cert_oids = encode_listing_ids(page.items)
         context["servers"] = [
             {
-                "key_id": key_id,
-                "cert_id": cert_id,
-                "names": [
-                    self._get_names(info["names"], index) for index in range(variations)
-                ],
+                "key_id": key_oid,
+                "cert_id": cert_oid,
+                "names": server["names"]
+                + ["N/A"] * (variations - len(server["names"])),
             }
-            for (key_id, cert_id), info in servers_info.items()
+            for key_oid, cert_oid, server in zip(
+                key_oids, cert_oids, page.items, strict=True
+            )
         ]
+        context["next_cursor"] = page.next_cursor and str(page.next_cursor)
         return context
 
-    @staticmethod
-    def _get_names(names: list[str], index: int) -> str:
+
+class ServerListView(View):
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        user = await request.auser()
+        if not isinstance(user, User):
+            return JsonResponse({"error": "Authentication required"}, status=401)
+        try:
+            page = await get_server_page(request)
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        server_oids = get_optimus().encode_many(server["id"] for server in page.items)
+        key_oids, cert_oids = encode_listing_ids(page.items)
+        return JsonResponse(
+            {
+                "servers": [
+                    {
+                        "server_id": server_oid,
+                        "key_id": key_oid,
+                        "cert_id": cert_oid,
+                        "names": server["names"],
+                    }
+                    for server_oid, key_oid, cert_oid, server in zip(
+                        server_oids, key_oids, cert_oids, page.items, strict=True
+                    )
+                ],
+                "next": page.next_cursor and str(page.next_cursor),
+            }
+        )
+
+
+def encode_listing_ids(
+    servers: list[ServerInfo],
+) -> tuple[list[int | None], list[int | None]]:
+    optimus = get_optimus()
+    return (
+        optimus.encode_nullable(server["key_id"] for server in servers),
+        optimus.encode_nullable(server["cert_id"] for server in servers),
+    )
+
+
+async def get_server_page(request: HttpRequest) -> Page[ServerInfo]:
+    user = await request.auser()
+    if not isinstance(user, User):
+        return Page(items=[], next_cursor=None)
+    raw_cursor = request.GET.get("cursor")
+    cursor = None if raw_cursor is None else Cursor.from_string(raw_cursor)
+    try:
+        page_size = int(request.GET.get("page_size", settings.SERVER_PAGE_SIZE))
+    except ValueError as exc:
+        msg = "Invalid page size"
+        raise ValueError(msg) from exc
+    page_size = min(max(page_size, 1), settings.SERVER_MAX_PAGE_SIZE)
+    return await apaginate(Server.objects.get_listing(user), cursor, page_size)
+
+
+class IssueServerView(View):
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        try:
+            payload = json.loads(request.body)
+            alternative_names = [str(name) for name in payload["alternative_names"]]
+            algorithm = payload.get("key_algorithm")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return JsonResponse(
+                {"error": "A list of alternative names is required"}, status=400
+            )
+        if not alternative_names:
+            return JsonResponse(
+                {"error": "A list of alternative names is required"}, status=400
+            )
+        if algorithm is not None and algorithm not in KeyAlgorithm.values:
+            return JsonResponse({"error": "Unknown key algorithm"}, status=400)
+
+        user = await request.auser()
+        if not isinstance(user, User):
+            return JsonResponse({"error": "Authentication required"}, status=401)
+        try:
+            _, key, certificate = await crypto_executor.run(
+                Server.objects.issue_for_alt_names, user, alternative_names, algorithm
+            )
+        except ExecutorFullError:
+            response = JsonResponse({"error": "Too many pending requests"}, status=503)
+            response["Retry-After"] = "1"
+            return response
+        return JsonResponse({"key_id": key.oid, "cert_id": certificate.oid}, status=201)
+
+
+class IssuanceJobView(View):
+    async def post(self, request: HttpRequest) -> JsonResponse:
         try:
-            return names[index]
-        except IndexError:
-            return "N/A"
+            payload = json.loads(request.body)
+            alternative_names = [str(name) for name in payload["alternative_names"]]
+            algorithm = payload.get("key_algorithm")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return JsonResponse(
+                {"error": "A list of alternative names is required"}, status=400
+            )
+        if not alternative_names:
+            return JsonResponse(
+                {"error": "A list of alternative names is required"}, status=400
+            )
+        if algorithm is not None and algorithm not in KeyAlgorithm.values:
+            return JsonResponse({"error": "Unknown key algorithm"}, status=400)
+
+        user = await request.auser()
+        if not isinstance(user, User):
+            return JsonResponse({"error": "Authentication required"}, status=401)
+        job = await IssuanceJob.objects.aenqueue(user, alternative_names, algorithm)
+        return JsonResponse({"job_id": job.oid, "status": job.status}, status=202)
+
+
+class IssuanceJobStatusView(View):
+    async def get(self, request: HttpRequest, job_id: int) -> JsonResponse:
+        user = await request.auser()
+        if not isinstance(user, User):
+            return JsonResponse({"error": "Authentication required"}, status=401)
+        job = await aget_object_or_404(
+            IssuanceJob.objects.select_related("server__key", "server__certificate"),
+            id=get_optimus().decode(job_id),
+            user=user,
+        )
+        data: JSONDict = {
+            "job_id": job_id,
+            "status": job.status,
+            "attempts": job.attempts,
+            "error": job.error,
+        }
+        if job.status == JobStatus.DONE and job.server is not None:
+            data["key_id"] = job.server.key.oid
+            data["cert_id"] = job.server.certificate.oid
+        return JsonResponse(data)
+
+
+class CertificateRevocationListView(View):
+    delta = False
+    pem = False
+
+    async def get(self, _request: HttpRequest) -> HttpResponse:
+        crl = (
+            await CertificateRevocationList.objects.filter(
+                base_number__isnull=not self.delta
+            )
+            .only("pem" if self.pem else "der", "this_update", "next_update")
+            .order_by("-number")
+            .afirst()
+        )
+        if crl is None:
+            msg = "No CRL has been generated"
+            raise Http404(msg)
+
+        if self.pem:
+            response = HttpResponse(crl.pem, content_type="application/x-pem-file")
+        else:
+            response = HttpResponse(bytes(crl.der), content_type="application/pkix-crl")
+        max_age = max(int((crl.next_update - now()).total_seconds()), 0)
+        response["Cache-Control"] = f"public, max-age={max_age}"
+        response["Last-Modified"] = http_date(crl.this_update.timestamp())
+        response["Expires"] = http_date(crl.next_update.timestamp())
+        return response
+
+
+class ServerBundleView(View):
+    chunk_size = 200
+
+    async def get(self, request: HttpRequest) -> StreamingHttpResponse | JsonResponse:
+        user = await request.auser()
+        if not isinstance(user, User):
+            return JsonResponse({"error": "Authentication required"}, status=401)
+        response = StreamingHttpResponse(
+            self.stream(user), content_type="application/x-tar"
+        )
+        response["Content-Disposition"] = "attachment; filename=servers.tar"
+        return response
+
+    async def stream(self, user: User) -> AsyncIterator[bytes]:
+        tar = TarStream()
+        ca_cert = await Certificate.objects.aget_ca_certificate()
+        if ca_cert is not None:
+            yield tar.add(
+                f"{settings.CA_NAME}.crt",
+                der_to_pem(ca_cert.certificate, PEMLabel.CERTIFICATE),
+                ca_cert.updated_at,
+            )
+        async for server in (
+            Server.objects.filter(
+                user=user, key__isnull=False, certificate__isnull=False
+            )
+            .select_related("key", "certificate")
+            .only(
+                "common_name",
+                "key__private_key",
+                "key__updated_at",
+                "certificate__certificate",
+                "certificate__updated_at",
+            )
+            .order_by("id")
+            .aiterator(chunk_size=self.chunk_size)
+        ):
+            yield tar.add(
+                f"{server.common_name}/server.key",
+                der_to_pem(server.key.private_key, PEMLabel.PRIVATE_KEY),
+                server.key.updated_at,
+                mode=0o600,
+            )
+            yield tar.add(
+                f"{server.common_name}/server.crt",
+                der_to_pem(server.certificate.certificate, PEMLabel.CERTIFICATE),
+                server.certificate.updated_at,
+            )
+        yield tar.close()
+
+
+class CryptoExecutorStatusView(ExecutorStatusView):
+    executor = crypto_executor
 
 
 class DownloadCertificateView(DownloadTextFileView):
     model = Certificate
+    fields = ("certificate", "csr")
+    cache_fields = ("self_signed",)
+
+    async def get_content(self, obj: BaseModel, field: str) -> str:
+        if field == "csr" and isinstance(obj, Certificate):
+            return der_to_pem(await crypto_executor.run(obj.get_csr), PEMLabel.CSR)
+        return der_to_pem(getattr(obj, field), PEMLabel.CERTIFICATE)
+
+    def get_cache_control(self, obj: BaseModel) -> str:
+        if isinstance(obj, Certificate) and obj.self_signed:
+            max_age = int(settings.CA_CERTIFICATE_MAX_AGE.total_seconds())
+            return f"public, max-age={max_age}"
+        return super().get_cache_control(obj)
 
 
 class DownloadKeyView(DownloadTextFileView):
     model = Key
+    fields = ("private_key",)
+
+    async def get_content(self, obj: BaseModel, field: str) -> str:
+        return der_to_pem(getattr(obj, field), PEMLabel.PRIVATE_KEY)
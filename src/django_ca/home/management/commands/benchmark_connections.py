@@ -0,0 +1,59 @@
+from copy import deepcopy
+from typing import cast
+
+from pyutilkit.timing import Stopwatch
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+
+class Command(BaseCommand):
+    help = "Compare the request latency of fresh and pooled database connections"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="The number of simulated requests for each connection mode",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        requests = cast(int, options["requests"])
+
+        fresh = self.measure(self.get_wrapper("benchmark_fresh", None), requests)
+        pooled_wrapper = self.get_wrapper(
+            "benchmark_pooled", settings.DB_POOL or {"min_size": 1, "max_size": 1}
+        )
+        try:
+            pooled = self.measure(pooled_wrapper, requests)
+        finally:
+            pooled_wrapper.close_pool()  # type: ignore[attr-defined]
+
+        saving = fresh.average.nanoseconds - pooled.average.nanoseconds
+        self.stdout.write(f"Fresh connections: {fresh.average} per request")
+        self.stdout.write(f"Pooled connections: {pooled.average} per request")
+        self.stdout.write(
+            f"Saving: {saving / fresh.average.nanoseconds:.1%} per request"
+        )
+
+    @staticmethod
+    def get_wrapper(alias: str, pool: dict[str, float] | None) -> BaseDatabaseWrapper:
+        settings_dict = deepcopy(connections[DEFAULT_DB_ALIAS].settings_dict)
+        settings_dict["CONN_MAX_AGE"] = 0
+        settings_dict["OPTIONS"] = {"pool": pool} if pool else {}
+        wrapper = type(connections[DEFAULT_DB_ALIAS])(settings_dict, alias)
+        connections[alias] = wrapper
+        return wrapper
+
+    @staticmethod
+    def measure(wrapper: BaseDatabaseWrapper, requests: int) -> Stopwatch:
+        stopwatch = Stopwatch()
+        for _ in range(requests):
+            with stopwatch:
+                with wrapper.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                wrapper.close()
+        return stopwatch
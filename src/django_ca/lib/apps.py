@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LibAppConfig(AppConfig):
     name = "django_ca.lib"
     verbose_name = "Lib"
+
+    def ready(self) -> None:
+        from django_ca.lib import signals  # noqa: F401
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from hashlib import sha256
+from typing import TYPE_CHECKING
+
+import jwt
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+
+from django_ca.lib.cache import aget_or_set, get_or_set
+from django_ca.lib.utils import JWT, TTLCache
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from django_ca.accounts.models import User
+
+USER_CACHE = "active_user"
+
+verified_tokens: TTLCache[str, JWT] = TTLCache(
+    settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_PERIOD
+)
+
+
+def get_token_email(token: str) -> str | None:
+    digest = sha256(token.encode()).hexdigest()
+    claims = verified_tokens.get(digest)
+    if claims is None:
+        try:
+            claims = JWT.from_token(token)
+        except (jwt.InvalidTokenError, TypeError):
+            return None
+        verified_tokens.set(digest, claims, ttl=claims.exp - time.time())
+    if claims.sub != "access":
+        return None
+    return claims.email
+
+
+USER_CACHE_FIELDS = (
+    "id",
+    "email",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "is_ca",
+    "default_organisation_id",
+)
+
+
+def _cached_fields() -> list[str]:
+    # from_db expects the values in the order of the model fields
+    return [
+        field.attname
+        for field in get_user_model()._meta.fields  # noqa: SLF001
+        if field.attname in USER_CACHE_FIELDS
+    ]
+
+
+def _active_users(email: str) -> QuerySet[User, tuple[object, ...]]:
+    users: QuerySet[User, tuple[object, ...]] = (
+        get_user_model()
+        .objects.filter(email=email, is_active=True)
+        .values_list(*_cached_fields())
+    )
+    return users
+
+
+def _build_user(values: tuple[object, ...] | None) -> User | AnonymousUser:
+    if values is None:
+        return AnonymousUser()
+    user: User = get_user_model().from_db(None, _cached_fields(), values)
+    return user
+
+
+def get_user(email: str | None) -> User | AnonymousUser:
+    if email is None:
+        return AnonymousUser()
+    values = get_or_set(
+        USER_CACHE, email, _active_users(email).first, settings.USER_CACHE_PERIOD
+    )
+    return _build_user(values)
+
+
+async def aget_user(email: str | None) -> User | AnonymousUser:
+    if email is None:
+        return AnonymousUser()
+    values = await aget_or_set(
+        USER_CACHE, email, _active_users(email).afirst, settings.USER_CACHE_PERIOD
+    )
+    return _build_user(values)
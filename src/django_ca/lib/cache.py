@@ -0,0 +1,79 @@
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from threading import Lock
+from typing import cast
+
+from django.conf import settings
+from django.core.cache import cache
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+    def record(self, *, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+cache_stats: defaultdict[str, CacheStats] = defaultdict(CacheStats)
+
+
+def make_key(namespace: str, key: object) -> str:
+    return f"{namespace}:{key}"
+
+
+def _get_timeout(period: timedelta | None) -> float:
+    return (period or settings.CACHE_PERIOD).total_seconds()
+
+
+def get_or_set[
+    T
+](
+    namespace: str,
+    key: object,
+    default: Callable[[], T],
+    period: timedelta | None = None,
+) -> T:
+    name = make_key(namespace, key)
+    value = cache.get(name, _MISSING)
+    cache_stats[namespace].record(hit=value is not _MISSING)
+    if value is _MISSING:
+        value = default()
+        cache.set(name, value, _get_timeout(period))
+    return cast(T, value)
+
+
+async def aget_or_set[
+    T
+](
+    namespace: str,
+    key: object,
+    default: Callable[[], Awaitable[T]],
+    period: timedelta | None = None,
+) -> T:
+    name = make_key(namespace, key)
+    value = await cache.aget(name, _MISSING)
+    cache_stats[namespace].record(hit=value is not _MISSING)
+    if value is _MISSING:
+        value = await default()
+        await cache.aset(name, value, _get_timeout(period))
+    return cast(T, value)
+
+
+def invalidate(keys: Iterable[str]) -> None:
+    cache.delete_many(list(keys))
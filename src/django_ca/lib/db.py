@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.transaction import TransactionManagementError
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    min_size: int
+    max_size: int
+    size: int
+    available: int
+    waiting: int
+    requests: int
+    queued: int
+    wait_ms: int
+    timeouts: int
+
+    @property
+    def in_use(self) -> int:
+        return self.size - self.available
+
+    @property
+    def saturation(self) -> float:
+        return self.in_use / self.max_size
+
+    @property
+    def average_wait_ms(self) -> float:
+        return self.wait_ms / self.requests if self.requests else 0
+
+
+def get_pool_stats(alias: str = DEFAULT_DB_ALIAS) -> PoolStats | None:
+    pool: ConnectionPool | None = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    return PoolStats(
+        min_size=stats["pool_min"],
+        max_size=stats["pool_max"],
+        size=stats["pool_size"],
+        available=stats["pool_available"],
+        waiting=stats["requests_waiting"],
+        requests=stats.get("requests_num", 0),
+        queued=stats.get("requests_queued", 0),
+        wait_ms=stats.get("requests_wait_ms", 0),
+        timeouts=stats.get("requests_errors", 0),
+    )
+
+
+def advisory_lock(
+    key: int, *, shared: bool = False, using: str = DEFAULT_DB_ALIAS
+) -> None:
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        msg = "Advisory locks can only be taken inside a transaction"
+        raise TransactionManagementError(msg)
+    function = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {function}(%s)", [key])
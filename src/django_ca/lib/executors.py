@@ -0,0 +1,90 @@
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from threading import BoundedSemaphore, Lock
+from typing import ParamSpec, TypeVar
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+
+class ExecutorFullError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutorStats:
+    max_workers: int
+    max_queue: int
+    running: int
+    queued: int
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._slots = BoundedSemaphore(max_workers + max_queue)
+        self._lock = Lock()
+        self._submitted = 0
+        self._running = 0
+
+    def get_stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                max_workers=self.max_workers,
+                max_queue=self.max_queue,
+                running=self._running,
+                queued=self._submitted - self._running,
+            )
+
+    async def run(
+        self, func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs
+    ) -> _T:
+        if not self._slots.acquire(blocking=False):
+            msg = "There are too many pending tasks"
+            raise ExecutorFullError(msg)
+        with self._lock:
+            self._submitted += 1
+        try:
+            return await sync_to_async(
+                self._call, thread_sensitive=False, executor=self._executor
+            )(partial(func, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._submitted -= 1
+            self._slots.release()
+
+    def _call(self, func: Callable[[], _T]) -> _T:
+        with self._lock:
+            self._running += 1
+        close_old_connections()
+        try:
+            return func()
+        finally:
+            close_old_connections()
+            with self._lock:
+                self._running -= 1
+
+
+def process_pool(max_workers: int | None) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers, mp_context=multiprocessing.get_context("forkserver")
+    )
+
+
+crypto_executor = BoundedExecutor(
+    "crypto",
+    max_workers=settings.CRYPTO_EXECUTOR_WORKERS,
+    max_queue=settings.CRYPTO_EXECUTOR_QUEUE_SIZE,
+)
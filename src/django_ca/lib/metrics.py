@@ -0,0 +1,263 @@
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from threading import Lock
+from typing import ClassVar, ParamSpec, Protocol, TypeVar
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+type LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(value)
+
+
+class _Renderable(Protocol):
+    name: str
+
+    def render(self) -> Iterator[str]: ...
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Renderable] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Renderable) -> None:
+        if metric.name in self._metrics:
+            msg = f"Metric {metric.name} is already registered"
+            raise ValueError(msg)
+        self._metrics[metric.name] = metric
+
+    def collector(self, func: Callable[[], None]) -> Callable[[], None]:
+        self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        for collect in self._collectors:
+            collect()
+        return "".join(
+            f"{line}\n"
+            for _, metric in sorted(self._metrics.items())
+            for line in metric.render()
+        )
+
+
+registry = Registry()
+
+
+class Metric[V](ABC):
+    kind: ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        registry: Registry = registry,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = Lock()
+        self._values: dict[LabelValues, V] = {}
+        registry.register(self)
+
+    def _get_label_values(self, labels: dict[str, object]) -> LabelValues:
+        if labels.keys() != set(self.labelnames):
+            msg = f"Metric {self.name} expects the labels {self.labelnames}"
+            raise ValueError(msg)
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_sample(
+        self,
+        suffix: str,
+        label_values: LabelValues,
+        value: float,
+        extra: tuple[tuple[str, str], ...] = (),
+    ) -> str:
+        pairs = [*zip(self.labelnames, label_values, strict=True), *extra]
+        labels = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+        if labels:
+            labels = f"{{{labels}}}"
+        return f"{self.name}{suffix}{labels} {_format_value(value)}"
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]: ...
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with self._lock:
+            yield from list(self.samples())
+
+
+class Counter(Metric[float]):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for label_values, value in sorted(self._values.items()):
+            yield self._format_sample("", label_values, value)
+
+
+class Gauge(Metric[float]):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> Iterator[str]:
+        for label_values, value in sorted(self._values.items()):
+            yield self._format_sample("", label_values, value)
+
+
+@dataclass(slots=True)
+class _HistogramValue:
+    counts: list[int]
+    sum: float = 0
+
+
+class Histogram(Metric[_HistogramValue]):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        registry: Registry = registry,
+    ) -> None:
+        super().__init__(name, documentation, labelnames, registry=registry)
+        self.buckets = (*sorted(buckets), float("inf"))
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._get_label_values(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._values.get(key)
+            if histogram is None:
+                histogram = _HistogramValue(counts=[0] * len(self.buckets))
+                self._values[key] = histogram
+            histogram.counts[index] += 1
+            histogram.sum += value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def timed(self, **labels: object) -> Callable[[Callable[_P, _T]], Callable[_P, _T]]:
+        def decorator(func: Callable[_P, _T]) -> Callable[_P, _T]:
+            @wraps(func)
+            def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _T:
+                with self.time(**labels):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def samples(self) -> Iterator[str]:
+        for label_values, histogram in sorted(self._values.items()):
+            total = 0
+            for bound, count in zip(self.buckets, histogram.counts, strict=True):
+                total += count
+                yield self._format_sample(
+                    "_bucket", label_values, total, (("le", _format_value(bound)),)
+                )
+            yield self._format_sample("_sum", label_values, histogram.sum)
+            yield self._format_sample("_count", label_values, total)
+
+
+@dataclass(slots=True)
+class QueryStats:
+    count: int = 0
+    seconds: float = 0
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+
+
+request_queries: ContextVar[QueryStats | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+@contextmanager
+def track_queries(stats: QueryStats | None = None) -> Iterator[QueryStats]:
+    if stats is None:
+        stats = QueryStats()
+    token = request_queries.set(stats)
+    try:
+        yield stats
+    finally:
+        request_queries.reset(token)
+
+
+def time_query[
+    T
+](
+    execute: Callable[[str, object, bool, dict[str, object]], T],
+    sql: str,
+    params: object,
+    many: bool,  # noqa: FBT001
+    context: dict[str, object],
+) -> T:
+    stats = request_queries.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(time.perf_counter() - start)
+
+
+request_seconds = Histogram(
+    "dj_ca_request_seconds",
+    "The time spent serving each request",
+    ("view", "method", "status"),
+)
+request_queries_count = Histogram(
+    "dj_ca_request_queries",
+    "The database queries executed by each request",
+    ("view",),
+    buckets=QUERY_BUCKETS,
+)
+request_query_seconds = Histogram(
+    "dj_ca_request_query_seconds",
+    "The time each request spent in database queries",
+    ("view",),
+)
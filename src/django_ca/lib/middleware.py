@@ -0,0 +1,149 @@
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from functools import partial
+
+from asgiref.sync import markcoroutinefunction
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase, StreamingHttpResponse
+from django.utils.functional import SimpleLazyObject
+
+from django_ca.lib.auth import aget_user, get_token_email, get_user
+from django_ca.lib.metrics import (
+    QueryStats,
+    request_queries_count,
+    request_query_seconds,
+    request_seconds,
+    track_queries,
+)
+from django_ca.lib.routers import replica_reads, use_database_state
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def wrap_streaming_content(
+    response: StreamingHttpResponse,
+    context: Callable[[], AbstractContextManager[object]],
+) -> None:
+    # streamed bodies are consumed after the middleware returns
+    content = response.streaming_content
+    if isinstance(content, AsyncIterator):
+
+        async def wrapped_async() -> AsyncIterator[bytes]:
+            with context():
+                async for chunk in content:
+                    yield chunk
+
+        response.streaming_content = wrapped_async()
+    else:
+
+        def wrapped() -> Iterator[bytes]:
+            with context():
+                yield from content
+
+        response.streaming_content = wrapped()
+
+
+class MetricsMiddleware:
+    sync_capable = False
+    async_capable = True
+
+    def __init__(
+        self, get_response: Callable[[HttpRequest], Awaitable[HttpResponseBase]]
+    ) -> None:
+        self.get_response = get_response
+        markcoroutinefunction(self)
+
+    async def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        start = time.perf_counter()
+        with track_queries() as queries:
+            response = await self.get_response(request)
+        if isinstance(response, StreamingHttpResponse):
+            wrap_streaming_content(
+                response,
+                partial(self.track_stream, request, response, start, queries),
+            )
+        else:
+            self.record(request, response, start, queries)
+        return response
+
+    @contextmanager
+    def track_stream(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        start: float,
+        queries: QueryStats,
+    ) -> Iterator[None]:
+        try:
+            with track_queries(queries):
+                yield
+        finally:
+            self.record(request, response, start, queries)
+
+    @staticmethod
+    def record(
+        request: HttpRequest,
+        response: HttpResponseBase,
+        start: float,
+        queries: QueryStats,
+    ) -> None:
+        match = request.resolver_match
+        view = match.view_name if match is not None else "unresolved"
+        request_seconds.observe(
+            time.perf_counter() - start,
+            view=view,
+            method=request.method,
+            status=response.status_code,
+        )
+        request_queries_count.observe(queries.count, view=view)
+        request_query_seconds.observe(queries.seconds, view=view)
+
+
+class JWTAuthenticationMiddleware:
+    sync_capable = False
+    async_capable = True
+
+    def __init__(
+        self, get_response: Callable[[HttpRequest], Awaitable[HttpResponseBase]]
+    ) -> None:
+        self.get_response = get_response
+        markcoroutinefunction(self)
+
+    async def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        email = get_token_email(token) if scheme.lower() == "bearer" else None
+        request.user = SimpleLazyObject(partial(get_user, email))  # type: ignore[assignment]
+        request.auser = partial(aget_user, email)
+        return await self.get_response(request)
+
+
+class ReplicaMiddleware:
+    sync_capable = False
+    async_capable = True
+
+    def __init__(
+        self, get_response: Callable[[HttpRequest], Awaitable[HttpResponseBase]]
+    ) -> None:
+        self.get_response = get_response
+        markcoroutinefunction(self)
+
+    async def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        enabled = (
+            request.method in SAFE_METHODS
+            and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+        )
+        with replica_reads(enabled=enabled) as state:
+            response = await self.get_response(request)
+        if isinstance(response, StreamingHttpResponse):
+            wrap_streaming_content(response, partial(use_database_state, state))
+        if state.pinned:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=int(settings.REPLICA_PIN_PERIOD.total_seconds()),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -6,7 +6,7 @@ from pyutilkit.date_utils import now
 from django.db import models
 from django.db.models.base import ModelBase
 
-from django_ca.lib.utils import Optimus
+from django_ca.lib.utils import get_optimus
 
 _T_co = TypeVar("_T_co", bound=models.Model, covariant=True)
 
@@ -54,12 +54,10 @@ class BaseQuerySet(models.QuerySet[_T_co]):
         return self.order_by("?").first()
 
     def get_by_oid(self, oid: int) -> _T_co:
-        optimus = Optimus()
-        return self.get(id=optimus.decode(oid))
+        return self.get(id=get_optimus().decode(oid))
 
     def filter_by_oid(self, oid: list[int]) -> Self:
-        optimus = Optimus()
-        return self.filter(id={optimus.decode(oid_) for oid_ in oid})
+        return self.filter(id__in=get_optimus().decode_many(oid))
 
     def update(self, **kwargs: object) -> int:
         kwargs.setdefault("updated_at", now())
@@ -90,7 +88,9 @@ class BaseModel(models.Model):
             update_fields=update_fields,
         )
 
+    def cache_keys(self) -> list[str]:
+        return []
+
     @property
     def oid(self) -> int:
-        optimus = Optimus()
-        return optimus.encode(self.id)  # type: ignore[attr-defined]
+        return get_optimus().encode(self.id)  # type: ignore[attr-defined]
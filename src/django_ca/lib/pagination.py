@@ -0,0 +1,62 @@
+import base64
+import binascii
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Self, cast
+
+from django.db import models
+
+from django_ca.lib.models import BaseModel
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    created_at: datetime
+    id: int
+
+    @classmethod
+    def from_string(cls, raw: str) -> Self:
+        try:
+            created_at, id_ = base64.urlsafe_b64decode(raw.encode()).decode().split("|")
+            return cls(created_at=datetime.fromisoformat(created_at), id=int(id_))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            msg = "Invalid cursor"
+            raise ValueError(msg) from exc
+
+    def __str__(self) -> str:
+        raw = f"{self.created_at.isoformat()}|{self.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+@dataclass(frozen=True, slots=True)
+class Page[T]:
+    items: list[T]
+    next_cursor: Cursor | None
+
+
+def seek[
+    M: models.Model, T
+](queryset: models.QuerySet[M, T], cursor: Cursor | None) -> models.QuerySet[M, T]:
+    queryset = queryset.order_by("created_at", "id")
+    if cursor is None:
+        return queryset
+    return queryset.filter(created_at__gte=cursor.created_at).exclude(
+        created_at=cursor.created_at, id__lte=cursor.id
+    )
+
+
+def _get_cursor(item: object) -> Cursor:
+    if isinstance(item, Mapping):
+        return Cursor(created_at=item["created_at"], id=item["id"])
+    obj = cast(BaseModel, item)
+    return Cursor(created_at=obj.created_at, id=obj.pk)
+
+
+async def apaginate[
+    M: models.Model, T
+](queryset: models.QuerySet[M, T], cursor: Cursor | None, page_size: int) -> Page[T]:
+    items = [item async for item in seek(queryset, cursor)[: page_size + 1]]
+    if len(items) > page_size:
+        return Page(items=items[:page_size], next_cursor=_get_cursor(items[-2]))
+    return Page(items=items, next_cursor=None)
@@ -0,0 +1,63 @@
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.db import DEFAULT_DB_ALIAS, connections, models
+
+REPLICA_DATABASE = "replica"
+
+
+@dataclass(slots=True)
+class DatabaseState:
+    use_replica: bool = False
+    pinned: bool = False
+
+
+database_state: ContextVar[DatabaseState | None] = ContextVar(
+    "database_state", default=None
+)
+
+
+@contextmanager
+def use_database_state(state: DatabaseState) -> Iterator[DatabaseState]:
+    token = database_state.set(state)
+    try:
+        yield state
+    finally:
+        database_state.reset(token)
+
+
+def replica_reads(*, enabled: bool = True) -> AbstractContextManager[DatabaseState]:
+    return use_database_state(DatabaseState(use_replica=enabled))
+
+
+class ReplicaRouter:
+    @staticmethod
+    def db_for_read(_model: type[models.Model], **_hints: object) -> str | None:
+        state = database_state.get()
+        if (
+            state is None
+            or not state.use_replica
+            or state.pinned
+            or REPLICA_DATABASE not in connections.settings
+        ):
+            return None
+        return REPLICA_DATABASE
+
+    @staticmethod
+    def db_for_write(_model: type[models.Model], **_hints: object) -> str:
+        state = database_state.get()
+        if state is not None:
+            state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    @staticmethod
+    def allow_relation(
+        _obj1: models.Model, _obj2: models.Model, **_hints: object
+    ) -> bool:
+        return True
+
+    @staticmethod
+    def allow_migrate(db: str, _app_label: str, **_hints: object) -> bool:
+        return db != REPLICA_DATABASE
@@ -0,0 +1,38 @@
+from functools import partial
+
+from django.core.signals import setting_changed
+from django.db import models, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django_ca.lib.cache import invalidate
+from django_ca.lib.metrics import time_query
+from django_ca.lib.models import BaseModel
+from django_ca.lib.utils import get_optimus
+
+
+@receiver(setting_changed)
+def clear_optimus(setting: str, **_kwargs: object) -> None:
+    if setting.startswith("OPTIMUS_"):
+        get_optimus.cache_clear()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_lookups(
+    instance: models.Model, using: str, **_kwargs: object
+) -> None:
+    if not isinstance(instance, BaseModel):
+        return
+    keys = instance.cache_keys()
+    if keys:
+        invalidate(keys)
+        transaction.on_commit(partial(invalidate, keys), using=using)
+
+
+@receiver(connection_created)
+def install_query_timer(connection: BaseDatabaseWrapper, **_kwargs: object) -> None:
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
@@ -1,5 +1,13 @@
+import io
+import tarfile
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from functools import cache
 from pathlib import Path
+from threading import Lock
 from typing import TYPE_CHECKING, Literal, Self
 
 import jwt
@@ -42,6 +50,47 @@ class JWT:
         return jwt.encode(asdict(self), settings.SECRET_KEY, algorithm="HS256")
 
 
+class TTLCache[K, V]:
+    def __init__(self, max_size: int, ttl: timedelta) -> None:
+        self.max_size = max_size
+        self.ttl = ttl.total_seconds()
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            try:
+                expires_at, value = self._items[key]
+            except KeyError:
+                return None
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        seconds = self.ttl if ttl is None else min(ttl, self.ttl)
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + seconds, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
 class Optimus:
     def __init__(self) -> None:
         self.max_int = 2**63 - 1
@@ -55,6 +104,50 @@ class Optimus:
     def decode(self, n: int) -> int:
         return ((n ^ self.random) * self.inverse) % self.max_int
 
+    def encode_many(self, numbers: Iterable[int]) -> list[int]:
+        max_int, prime, random = self.max_int, self.prime, self.random
+        return [((n * prime) % max_int) ^ random for n in numbers]
+
+    def encode_nullable(self, numbers: Iterable[int | None]) -> list[int | None]:
+        max_int, prime, random = self.max_int, self.prime, self.random
+        return [
+            None if n is None else ((n * prime) % max_int) ^ random for n in numbers
+        ]
+
+    def decode_many(self, numbers: Iterable[int]) -> list[int]:
+        max_int, inverse, random = self.max_int, self.inverse, self.random
+        return [((n ^ random) * inverse) % max_int for n in numbers]
+
+
+@cache
+def get_optimus() -> Optimus:
+    return Optimus()
+
+
+class TarStream:
+    def __init__(self) -> None:
+        self._buffer = io.BytesIO()
+        self._tar = tarfile.open(fileobj=self._buffer, mode="w|")  # noqa: SIM115
+
+    def add(self, name: str, content: str, mtime: datetime, mode: int = 0o644) -> bytes:
+        data = content.encode()
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(mtime.timestamp())
+        info.mode = mode
+        self._tar.addfile(info, io.BytesIO(data))
+        return self._flush()
+
+    def close(self) -> bytes:
+        self._tar.close()
+        return self._flush()
+
+    def _flush(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
 
 def get_app_url(path: str, **kwargs: str | list[str]) -> URL:
     return URL.from_parts(
@@ -1,19 +1,180 @@
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import get_object_or_404
+from ipaddress import ip_address
+from typing import ClassVar
+
+from django.conf import settings
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBase,
+    JsonResponse,
+)
+from django.shortcuts import aget_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.views.generic import View
 
+from django_ca.lib.cache import cache_stats
+from django_ca.lib.db import get_pool_stats
+from django_ca.lib.executors import BoundedExecutor, crypto_executor
+from django_ca.lib.metrics import Gauge, registry
 from django_ca.lib.models import BaseModel
+from django_ca.lib.utils import get_optimus
 
 
 class DownloadTextFileView(View):
     model: type[BaseModel]
+    fields: ClassVar[tuple[str, ...]]
+    cache_fields: ClassVar[tuple[str, ...]] = ()
 
-    def get(
-        self, _request: HttpRequest, obj_id: int, field: str, filename: str
+    async def get(
+        self, request: HttpRequest, obj_id: int, field: str, filename: str
     ) -> HttpResponse:
-        obj = get_object_or_404(self.model, pk=obj_id)
+        if field not in self.fields:
+            msg = f"There is no downloadable field {field}"
+            raise Http404(msg)
+        conditional = (
+            "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+        )
+        eager_fields = [] if conditional else [field]
+        obj = await aget_object_or_404(
+            self.model.objects.only("updated_at", *self.cache_fields, *eager_fields),
+            pk=get_optimus().decode(obj_id),
+        )
+
+        response = get_conditional_response(
+            request,
+            etag=self.get_etag(obj, field),
+            last_modified=int(obj.updated_at.timestamp()),
+        )
+        if response is None:
+            if conditional:
+                await obj.arefresh_from_db(fields=[field])
+            response = HttpResponse(
+                await self.get_content(obj, field), content_type="text/plain"
+            )
+            response["Content-Disposition"] = f"attachment; filename={filename}"
+        response["ETag"] = self.get_etag(obj, field)
+        response["Last-Modified"] = http_date(obj.updated_at.timestamp())
+        response["Cache-Control"] = self.get_cache_control(obj)
+
+        return response
+
+    async def get_content(self, obj: BaseModel, field: str) -> str:
+        content: str = getattr(obj, field)
+        return content
+
+    @staticmethod
+    def get_etag(obj: BaseModel, field: str) -> str:
+        return f'"{obj.pk}-{field}-{int(obj.updated_at.timestamp() * 1_000_000)}"'
 
-        response = HttpResponse(getattr(obj, field), content_type="text/plain")
-        response["Content-Disposition"] = f"attachment; filename={filename}"
+    def get_cache_control(self, _obj: BaseModel) -> str:
+        return "private, no-cache"
 
+
+class StatusView(View):
+    def dispatch(
+        self, request: HttpRequest, *args: object, **kwargs: object
+    ) -> HttpResponseBase:
+        if self.is_allowed(request):
+            return super().dispatch(request, *args, **kwargs)
+        response = JsonResponse({"error": "Forbidden"}, status=403)
+        if self.view_is_async:
+
+            async def func() -> HttpResponseBase:
+                return response
+
+            return func()  # type: ignore[return-value]
         return response
+
+    @staticmethod
+    def is_allowed(request: HttpRequest) -> bool:
+        try:
+            address = ip_address(request.META.get("REMOTE_ADDR", ""))
+        except ValueError:
+            return False
+        return any(address in network for network in settings.STATUS_ALLOWED_NETWORKS)
+
+
+executor_tasks = Gauge(
+    "dj_ca_executor_tasks", "The tasks of the crypto executor", ("state",)
+)
+pool_connections = Gauge(
+    "dj_ca_db_pool_connections", "The connections of the database pool", ("state",)
+)
+cache_lookups = Gauge(
+    "dj_ca_cache_lookups", "The cached lookups", ("namespace", "result")
+)
+
+
+@registry.collector
+def collect_runtime_stats() -> None:
+    executor_stats = crypto_executor.get_stats()
+    executor_tasks.set(executor_stats.running, state="running")
+    executor_tasks.set(executor_stats.queued, state="queued")
+    pool_stats = get_pool_stats()
+    if pool_stats is not None:
+        pool_connections.set(pool_stats.in_use, state="in_use")
+        pool_connections.set(pool_stats.available, state="available")
+        pool_connections.set(pool_stats.waiting, state="waiting")
+    for namespace, stats in list(cache_stats.items()):
+        cache_lookups.set(stats.hits, namespace=namespace, result="hit")
+        cache_lookups.set(stats.misses, namespace=namespace, result="miss")
+
+
+class ExecutorStatusView(StatusView):
+    executor: BoundedExecutor
+
+    async def get(self, _request: HttpRequest) -> JsonResponse:
+        stats = self.executor.get_stats()
+        return JsonResponse(
+            {
+                "max_workers": stats.max_workers,
+                "max_queue": stats.max_queue,
+                "running": stats.running,
+                "queued": stats.queued,
+            }
+        )
+
+
+class DatabasePoolStatusView(StatusView):
+    async def get(self, _request: HttpRequest) -> JsonResponse:
+        stats = get_pool_stats()
+        if stats is None:
+            return JsonResponse({"error": "Connection pooling is disabled"}, status=404)
+        return JsonResponse(
+            {
+                "min_size": stats.min_size,
+                "max_size": stats.max_size,
+                "size": stats.size,
+                "available": stats.available,
+                "in_use": stats.in_use,
+                "waiting": stats.waiting,
+                "saturation": stats.saturation,
+                "requests": stats.requests,
+                "queued": stats.queued,
+                "average_wait_ms": stats.average_wait_ms,
+                "timeouts": stats.timeouts,
+            }
+        )
+
+
+class CacheStatsView(StatusView):
+    async def get(self, _request: HttpRequest) -> JsonResponse:
+        return JsonResponse(
+            {
+                namespace: {
+                    "hits": stats.hits,
+                    "misses": stats.misses,
+                    "hit_ratio": stats.hit_ratio,
+                }
+                for namespace, stats in sorted(cache_stats.items())
+            }
+        )
+
+
+class MetricsView(StatusView):
+    async def get(self, _request: HttpRequest) -> HttpResponse:
+        return HttpResponse(
+            registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class OCSPConfig(AppConfig):
+    name = "django_ca.ocsp"
+    verbose_name = "OCSP"
+
+    def ready(self) -> None:
+        from django_ca.ocsp import signals  # noqa: F401
@@ -0,0 +1,48 @@
+import time
+from typing import cast
+
+from pyutilkit.timing import Stopwatch
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from django_ca.ocsp.models import OCSPResponse
+
+
+class Command(BaseCommand):
+    help = "Sign the missing and expiring OCSP responses"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of responses to sign and save at once",
+        )
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep refreshing the responses every interval",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=600,
+            help="The seconds between refreshes in daemon mode",
+        )
+
+    def handle(self, *_args: object, **options: object) -> None:
+        batch_size = cast(int, options["batch_size"])
+        daemon = cast(bool, options["daemon"])
+        interval = cast(int, options["interval"])
+
+        while True:
+            with Stopwatch() as stopwatch:
+                refreshed = OCSPResponse.objects.refresh_stale(batch_size)
+            self.stdout.write(
+                f"Refreshed {refreshed} OCSP responses in {stopwatch.elapsed}"
+            )
+            if not daemon:
+                break
+            close_old_connections()
+            time.sleep(interval)
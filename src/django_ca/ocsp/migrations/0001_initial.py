@@ -0,0 +1,57 @@
+import pyutilkit.date_utils
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("certificates", "0005_issuance_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OCSPResponse",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=pyutilkit.date_utils.now, editable=False
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        default=pyutilkit.date_utils.now, editable=False
+                    ),
+                ),
+                ("serial_number", models.CharField(max_length=40, unique=True)),
+                ("response", models.BinaryField()),
+                ("this_update", models.DateTimeField()),
+                ("next_update", models.DateTimeField(db_index=True)),
+                (
+                    "certificate",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ocsp_response",
+                        to="certificates.certificate",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
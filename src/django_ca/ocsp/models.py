@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, ClassVar
+
+from cryptography import x509
+from pyutilkit.date_utils import now
+
+from django.conf import settings
+from django.db import models
+from django.db.models import prefetch_related_objects
+
+from django_ca.certificates.models import Certificate, Revocation
+from django_ca.certificates.utils import format_serial_number
+from django_ca.lib.models import BaseModel, BaseQuerySet
+from django_ca.ocsp.utils import build_ocsp_response
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class OCSPResponseManager(models.Manager.from_queryset(BaseQuerySet["OCSPResponse"])):  # type: ignore[misc]
+    def sign(self, certificates: Iterable[Certificate]) -> list[OCSPResponse]:
+        certificates = list(certificates)
+        prefetch_related_objects(certificates, "revocation")
+        ca_material = Certificate.objects.get_ca_material()
+        this_update = now()
+        next_update = this_update + settings.OCSP_VALIDITY_PERIOD
+        responses = []
+        for certificate in certificates:
+            certificate_object = x509.load_der_x509_certificate(certificate.certificate)
+            try:
+                revocation: Revocation | None = certificate.revocation
+            except Revocation.DoesNotExist:
+                revocation = None
+            responses.append(
+                OCSPResponse(
+                    certificate=certificate,
+                    serial_number=format_serial_number(
+                        certificate_object.serial_number
+                    ),
+                    response=build_ocsp_response(
+                        certificate_object,
+                        ca_material,
+                        this_update,
+                        next_update,
+                        revocation=(
+                            None if revocation is None else revocation.revoked_serial
+                        ),
+                    ),
+                    this_update=this_update,
+                    next_update=next_update,
+                )
+            )
+        saved: list[OCSPResponse] = self.bulk_create(
+            responses,
+            update_conflicts=True,
+            unique_fields=["certificate"],
+            update_fields=[
+                "serial_number",
+                "response",
+                "this_update",
+                "next_update",
+                "updated_at",
+            ],
+        )
+        return saved
+
+    def refresh_stale(self, batch_size: int) -> int:
+        threshold = now() + settings.OCSP_REFRESH_MARGIN
+        stale = (
+            Certificate.objects.filter(self_signed=False)
+            .filter(
+                models.Q(ocsp_response__isnull=True)
+                | models.Q(ocsp_response__next_update__lt=threshold)
+            )
+            .select_related("revocation")
+            .only(
+                "id",
+                "certificate",
+                "revocation__serial_number",
+                "revocation__revoked_at",
+                "revocation__reason",
+            )
+            .order_by("id")
+        )
+        refreshed = 0
+        last_id = 0
+        while batch := list(stale.filter(id__gt=last_id)[:batch_size]):
+            refreshed += len(self.sign(batch))
+            last_id = batch[-1].id
+        return refreshed
+
+
+class OCSPResponse(BaseModel):
+    certificate = models.OneToOneField(
+        Certificate, on_delete=models.CASCADE, related_name="ocsp_response"
+    )
+    serial_number = models.CharField(max_length=40, unique=True)
+    response = models.BinaryField()
+    this_update = models.DateTimeField()
+    next_update = models.DateTimeField(db_index=True)
+
+    objects: ClassVar[OCSPResponseManager] = OCSPResponseManager()
+
+    def __str__(self) -> str:
+        return f"OCSP response for {self.serial_number}"
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from django_ca.certificates.models import Certificate, Revocation
+from django_ca.certificates.signals import certificates_issued, certificates_renewed
+from django_ca.ocsp.models import OCSPResponse
+
+
+@receiver(post_save, sender=Revocation)
+def refresh_revoked_response(instance: Revocation, **_kwargs: object) -> None:
+    OCSPResponse.objects.sign([instance.certificate])
+
+
+@receiver(post_save, sender=Certificate)
+def sign_issued_response(
+    instance: Certificate, *, created: bool, **_kwargs: object
+) -> None:
+    if created and not instance.self_signed:
+        OCSPResponse.objects.sign([instance])
+
+
+@receiver(certificates_issued)
+@receiver(certificates_renewed)
+def sign_bulk_responses(certificates: list[Certificate], **_kwargs: object) -> None:
+    OCSPResponse.objects.sign(certificates)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from django_ca.ocsp import views
+
+app_name = "ocsp"
+urlpatterns = [
+    path("", views.OCSPView.as_view(), name="post"),
+    path("<path:encoded_request>", views.OCSPView.as_view(), name="get"),
+]
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.x509 import ocsp
+
+from django_ca.certificates.utils import CAMaterial, RevokedSerial, get_hash_algorithm
+
+
+def build_ocsp_response(
+    certificate: x509.Certificate,
+    ca_material: CAMaterial,
+    this_update: datetime,
+    next_update: datetime,
+    revocation: RevokedSerial | None = None,
+) -> bytes:
+    return (
+        ocsp.OCSPResponseBuilder()
+        .add_response(
+            cert=certificate,
+            issuer=ca_material.certificate,
+            algorithm=hashes.SHA1(),  # noqa: S303
+            cert_status=(
+                ocsp.OCSPCertStatus.GOOD
+                if revocation is None
+                else ocsp.OCSPCertStatus.REVOKED
+            ),
+            this_update=this_update,
+            next_update=next_update,
+            revocation_time=None if revocation is None else revocation.revoked_at,
+            revocation_reason=(
+                None if revocation is None else x509.ReasonFlags(revocation.reason)
+            ),
+        )
+        .responder_id(ocsp.OCSPResponderEncoding.HASH, ca_material.certificate)
+        .sign(
+            ca_material.private_key,
+            algorithm=get_hash_algorithm(ca_material.private_key),
+        )
+        .public_bytes(serialization.Encoding.DER)
+    )
+
+
+def build_unsuccessful_response(status: ocsp.OCSPResponseStatus) -> bytes:
+    return ocsp.OCSPResponseBuilder.build_unsuccessful(status).public_bytes(
+        serialization.Encoding.DER
+    )
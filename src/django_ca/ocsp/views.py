@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from urllib.parse import unquote
+
+from cryptography.x509 import ocsp
+from pyutilkit.date_utils import now
+
+from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+from django.views.generic import View
+
+from django_ca.certificates.utils import format_serial_number
+from django_ca.ocsp.models import OCSPResponse
+from django_ca.ocsp.utils import build_unsuccessful_response
+
+CONTENT_TYPE = "application/ocsp-response"
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class OCSPView(View):
+    async def get(self, _request: HttpRequest, encoded_request: str) -> HttpResponse:
+        try:
+            data = base64.b64decode(unquote(encoded_request), validate=True)
+        except (binascii.Error, ValueError):
+            return self.unsuccessful(ocsp.OCSPResponseStatus.MALFORMED_REQUEST)
+        return await self.respond(data)
+
+    async def post(self, request: HttpRequest) -> HttpResponse:
+        if request.content_type != "application/ocsp-request":
+            return self.unsuccessful(ocsp.OCSPResponseStatus.MALFORMED_REQUEST)
+        return await self.respond(request.body)
+
+    async def respond(self, data: bytes) -> HttpResponse:
+        try:
+            ocsp_request = ocsp.load_der_ocsp_request(data)
+        except ValueError:
+            return self.unsuccessful(ocsp.OCSPResponseStatus.MALFORMED_REQUEST)
+
+        ocsp_response = (
+            await OCSPResponse.objects.filter(
+                serial_number=format_serial_number(ocsp_request.serial_number)
+            )
+            .only("response", "this_update", "next_update")
+            .afirst()
+        )
+        if ocsp_response is None:
+            return self.unsuccessful(ocsp.OCSPResponseStatus.UNAUTHORIZED)
+        max_age = int((ocsp_response.next_update - now()).total_seconds())
+        if max_age <= 0:
+            return self.unsuccessful(ocsp.OCSPResponseStatus.TRY_LATER)
+
+        response = HttpResponse(
+            bytes(ocsp_response.response), content_type=CONTENT_TYPE
+        )
+        response["Cache-Control"] = f"public, max-age={max_age}, no-transform"
+        response["Last-Modified"] = http_date(ocsp_response.this_update.timestamp())
+        response["Expires"] = http_date(ocsp_response.next_update.timestamp())
+        return response
+
+    @staticmethod
+    def unsuccessful(status: ocsp.OCSPResponseStatus) -> HttpResponse:
+        return HttpResponse(
+            build_unsuccessful_response(status), content_type=CONTENT_TYPE
+        )
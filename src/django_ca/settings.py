@@ -1,11 +1,15 @@
 import contextlib
+import os
 from datetime import timedelta
 from functools import partial
+from ipaddress import ip_network
 from pathlib import Path
 
 import django_stubs_ext
 from dj_settings import get_setting
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).parents[2]
 PROJECT_DIR = BASE_DIR.joinpath("src")
 project_setting = partial(get_setting, project_dir=BASE_DIR, filename="django_ca.yaml")
@@ -22,6 +26,16 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 SECRET_KEY = project_setting("DJ_CA_SECRET_KEY", sections=["project", "security"])
+status_allowed_networks = project_setting(
+    "DJ_CA_STATUS_ALLOWED_NETWORKS",
+    sections=["project", "security"],
+    default="127.0.0.0/8,::1/128",
+)
+STATUS_ALLOWED_NETWORKS = [
+    ip_network(network.strip())
+    for network in status_allowed_networks.split(",")
+    if network.strip()
+]
 
 signup_token_expiry = project_setting(
     "DJ_CA_SIGNUP_TOKEN_EXPIRY", sections=["project", "tokens"], rtype=dict
@@ -35,6 +49,26 @@ refresh_token_expiry = project_setting(
     "DJ_CA_REFRESH_TOKEN_EXPIRY", sections=["project", "tokens"], rtype=dict
 )
 REFRESH_TOKEN_EXPIRY = timedelta(**refresh_token_expiry)
+token_cache_seconds = project_setting(
+    "DJ_CA_TOKEN_CACHE_SECONDS",
+    sections=["project", "tokens"],
+    rtype=int,
+    default=300,
+)
+TOKEN_CACHE_PERIOD = timedelta(seconds=token_cache_seconds)
+TOKEN_CACHE_SIZE = project_setting(
+    "DJ_CA_TOKEN_CACHE_SIZE",
+    sections=["project", "tokens"],
+    rtype=int,
+    default=10_000,
+)
+user_cache_seconds = project_setting(
+    "DJ_CA_USER_CACHE_SECONDS",
+    sections=["project", "tokens"],
+    rtype=int,
+    default=60,
+)
+USER_CACHE_PERIOD = timedelta(seconds=user_cache_seconds)
 # endregion
 
 # region Application definition
@@ -68,10 +102,12 @@ INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.auth",
     "django.contrib.messages",
+    "django.contrib.postgres",
     "corsheaders",
     "django_ca.lib",
     "django_ca.accounts",
     "django_ca.certificates",
+    "django_ca.ocsp",
     "django_ca.home",
 ]
 
@@ -79,9 +115,12 @@ if DEBUG and not CI_MODE:
     INSTALLED_APPS += ["django_extensions"]
 
 MIDDLEWARE = [
+    "django_ca.lib.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "django_ca.lib.middleware.ReplicaMiddleware",
+    "django_ca.lib.middleware.JWTAuthenticationMiddleware",
 ]
 
 TEMPLATES = [
@@ -155,7 +194,66 @@ RSA_PUBLIC_EXPONENT = project_setting(
     rtype=int,
     default=65537,
 )
+KEY_ALGORITHM = project_setting(
+    "DJ_CA_KEY_ALGORITHM", sections=["project", "certificates"], default="rsa"
+)
+CA_KEY_ALGORITHM = project_setting(
+    "DJ_CA_CA_KEY_ALGORITHM",
+    sections=["project", "certificates"],
+    default=KEY_ALGORITHM,
+)
+KEY_POOL_SIZE = project_setting(
+    "DJ_CA_KEY_POOL_SIZE", sections=["project", "certificates"], rtype=int, default=100
+)
+KEY_POOL_REFILL_INTERVAL = project_setting(
+    "DJ_CA_KEY_POOL_REFILL_INTERVAL",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=60,
+)
+CRYPTO_EXECUTOR_WORKERS = project_setting(
+    "DJ_CA_CRYPTO_EXECUTOR_WORKERS",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=os.cpu_count() or 1,
+)
+CRYPTO_EXECUTOR_QUEUE_SIZE = project_setting(
+    "DJ_CA_CRYPTO_EXECUTOR_QUEUE_SIZE",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=64,
+)
+ISSUANCE_JOB_MAX_ATTEMPTS = project_setting(
+    "DJ_CA_ISSUANCE_JOB_MAX_ATTEMPTS",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=3,
+)
+ISSUANCE_JOB_RETRY_DELAY = project_setting(
+    "DJ_CA_ISSUANCE_JOB_RETRY_DELAY",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=30,
+)
+ISSUANCE_JOB_TIMEOUT = project_setting(
+    "DJ_CA_ISSUANCE_JOB_TIMEOUT",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=300,
+)
 
+SERVER_PAGE_SIZE = project_setting(
+    "DJ_CA_SERVER_PAGE_SIZE",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=100,
+)
+SERVER_MAX_PAGE_SIZE = project_setting(
+    "DJ_CA_SERVER_MAX_PAGE_SIZE",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=1000,
+)
 
 ca_validity_days = project_setting(
     "DJ_CA_CA_VALIDITY_DAYS",
@@ -164,6 +262,13 @@ ca_validity_days = project_setting(
     default=20 * 365,
 )
 CA_VALIDITY_PERIOD = timedelta(days=ca_validity_days)
+ca_material_check_seconds = project_setting(
+    "DJ_CA_CA_MATERIAL_CHECK_SECONDS",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=5,
+)
+CA_MATERIAL_CHECK_PERIOD = timedelta(seconds=ca_material_check_seconds)
 server_validity_days = project_setting(
     "DJ_CA_SERVER_VALIDITY_DAYS",
     sections=["project", "certificates"],
@@ -171,12 +276,170 @@ server_validity_days = project_setting(
     default=5 * 365,
 )
 SERVER_VALIDITY_PERIOD = timedelta(days=server_validity_days)
+renewal_window_days = project_setting(
+    "DJ_CA_RENEWAL_WINDOW_DAYS",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=30,
+)
+RENEWAL_WINDOW = timedelta(days=renewal_window_days)
+ocsp_validity_hours = project_setting(
+    "DJ_CA_OCSP_VALIDITY_HOURS",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=24,
+)
+OCSP_VALIDITY_PERIOD = timedelta(hours=ocsp_validity_hours)
+ocsp_refresh_margin_hours = project_setting(
+    "DJ_CA_OCSP_REFRESH_MARGIN_HOURS",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=6,
+)
+OCSP_REFRESH_MARGIN = timedelta(hours=ocsp_refresh_margin_hours)
+crl_validity_hours = project_setting(
+    "DJ_CA_CRL_VALIDITY_HOURS",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=7 * 24,
+)
+CRL_VALIDITY_PERIOD = timedelta(hours=crl_validity_hours)
+delta_crl_validity_hours = project_setting(
+    "DJ_CA_DELTA_CRL_VALIDITY_HOURS",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=24,
+)
+DELTA_CRL_VALIDITY_PERIOD = timedelta(hours=delta_crl_validity_hours)
+ca_certificate_max_age_days = project_setting(
+    "DJ_CA_CA_CERTIFICATE_MAX_AGE_DAYS",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=30,
+)
+CA_CERTIFICATE_MAX_AGE = timedelta(days=ca_certificate_max_age_days)
+CRL_CHUNK_SIZE = project_setting(
+    "DJ_CA_CRL_CHUNK_SIZE",
+    sections=["project", "certificates"],
+    rtype=int,
+    default=10000,
+)
 # endregion
 
 # region Databases
 db_name = project_setting("DJ_CA_DB_NAME", sections=["project", "database"])
+db_pool_min_size = project_setting(
+    "DJ_CA_DB_POOL_MIN_SIZE",
+    sections=["project", "database"],
+    rtype=int,
+    default=2,
+)
+db_pool_max_size = project_setting(
+    "DJ_CA_DB_POOL_MAX_SIZE",
+    sections=["project", "database"],
+    rtype=int,
+    default=10,
+)
+db_pool_timeout_seconds = project_setting(
+    "DJ_CA_DB_POOL_TIMEOUT_SECONDS",
+    sections=["project", "database"],
+    rtype=float,
+    default=10,
+)
+db_pool_max_idle_seconds = project_setting(
+    "DJ_CA_DB_POOL_MAX_IDLE_SECONDS",
+    sections=["project", "database"],
+    rtype=float,
+    default=600,
+)
+db_pool_max_lifetime_seconds = project_setting(
+    "DJ_CA_DB_POOL_MAX_LIFETIME_SECONDS",
+    sections=["project", "database"],
+    rtype=float,
+    default=3600,
+)
+db_conn_max_age_seconds = project_setting(
+    "DJ_CA_DB_CONN_MAX_AGE_SECONDS",
+    sections=["project", "database"],
+    rtype=int,
+    default=60,
+)
+db_health_checks = project_setting(
+    "DJ_CA_DB_HEALTH_CHECKS",
+    sections=["project", "database"],
+    rtype=bool,
+    default=True,
+)
+DB_POOL = (
+    {
+        "min_size": db_pool_min_size,
+        "max_size": db_pool_max_size,
+        "timeout": db_pool_timeout_seconds,
+        "max_idle": db_pool_max_idle_seconds,
+        "max_lifetime": db_pool_max_lifetime_seconds,
+    }
+    if db_pool_max_size > 0
+    else None
+)
 DATABASES = {
-    "default": {"ENGINE": "django.db.backends.postgresql", "NAME": db_name},
+    "default": {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": db_name,
+        "CONN_MAX_AGE": 0 if DB_POOL else db_conn_max_age_seconds,
+        "CONN_HEALTH_CHECKS": db_health_checks,
+        "OPTIONS": {"pool": DB_POOL} if DB_POOL else {},
+    },
+}
+db_replica_name = project_setting(
+    "DJ_CA_DB_REPLICA_NAME", sections=["project", "database"], default=None
+)
+db_replica_host = project_setting(
+    "DJ_CA_DB_REPLICA_HOST", sections=["project", "database"], default=None
+)
+if db_replica_name or db_replica_host:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": db_replica_name or db_name,
+        "HOST": db_replica_host or "",
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["django_ca.lib.routers.ReplicaRouter"]
+replica_pin_seconds = project_setting(
+    "DJ_CA_REPLICA_PIN_SECONDS",
+    sections=["project", "database"],
+    rtype=int,
+    default=5,
+)
+REPLICA_PIN_PERIOD = timedelta(seconds=replica_pin_seconds)
+REPLICA_PIN_COOKIE = "dj_ca_primary"
+# endregion
+
+# region Caches
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+cache_backend = project_setting(
+    "DJ_CA_CACHE_BACKEND", sections=["project", "cache"], default="locmem"
+)
+cache_location = project_setting(
+    "DJ_CA_CACHE_LOCATION", sections=["project", "cache"], default=""
+)
+if cache_backend == "file" and not cache_location:
+    msg = "DJ_CA_CACHE_LOCATION must be set for the file cache backend"
+    raise ImproperlyConfigured(msg)
+cache_seconds = project_setting(
+    "DJ_CA_CACHE_SECONDS", sections=["project", "cache"], rtype=int, default=300
+)
+CACHE_PERIOD = timedelta(seconds=cache_seconds)
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[cache_backend],
+        "LOCATION": cache_location,
+        "TIMEOUT": cache_seconds,
+        "KEY_PREFIX": "dj_ca",
+    },
 }
 # endregion
 
@@ -1,9 +1,15 @@
 from django.urls import include, path
 
+from django_ca.lib.views import CacheStatsView, DatabasePoolStatusView, MetricsView
+
 urlpatterns = [
     path("api/accounts/", include("django.contrib.auth.urls")),
     path(
         "api/certificates/",
         include("django_ca.certificates.urls", namespace="certificates"),
     ),
+    path("api/certificates/ocsp/", include("django_ca.ocsp.urls", namespace="ocsp")),
+    path("api/cache/stats/", CacheStatsView.as_view(), name="cache_stats"),
+    path("api/database/pool/", DatabasePoolStatusView.as_view(), name="database_pool"),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
 ]
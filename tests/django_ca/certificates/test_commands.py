@@ -0,0 +1,176 @@
+import io
+import json
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from cryptography import x509
+from pyutilkit.date_utils import now
+
+from django.core.management import call_command
+
+from django_ca.accounts.models import User
+from django_ca.certificates.models import (
+    Certificate,
+    IssuanceJob,
+    JobStatus,
+    Revocation,
+    Server,
+)
+from django_ca.certificates.utils import RevocationReason
+from django_ca.ocsp.models import OCSPResponse
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_issue_certificates(user: User, tmp_path: Path) -> None:
+    manifest = tmp_path.joinpath("manifest.csv")
+    manifest.write_text(
+        "email,alternative_names\n"
+        f"{user.email},kuma.ai www.kuma.ai\n"
+        f"{user.email},www.kuma.ai kuma.ai\n"
+        "missing@kuma.ai,kuma.ai\n"
+        f"{user.email},api.kuma.ai\n"
+    )
+    errors = tmp_path.joinpath("errors.jsonl")
+
+    call_command("issue_certificates", manifest, errors=errors, workers=2)
+
+    assert Server.objects.filter(user=user).count() == 2
+    server = Server.objects.get(alternative_names__name="api.kuma.ai")
+    certificate = x509.load_der_x509_certificate(server.certificate.certificate)
+    assert certificate.extensions.get_extension_for_class(
+        x509.SubjectAlternativeName
+    ).value.get_values_for_type(x509.DNSName) == ["api.kuma.ai"]
+    assert Certificate.objects.filter(self_signed=False).count() == 2
+    assert [json.loads(line)["line"] for line in errors.read_text().splitlines()] == [
+        3,
+        4,
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_issue_certificates_invalid_rows(user: User, tmp_path: Path) -> None:
+    manifest = tmp_path.joinpath("manifest.jsonl")
+    manifest.write_text(
+        "\n".join(
+            [
+                json.dumps({"email": user.email, "alternative_names": "cc.x.io"}),
+                json.dumps({"alternative_names": ["kuma.ai"]}),
+                "{",
+                json.dumps(["kuma.ai"]),
+                json.dumps({"email": user.email, "alternative_names": []}),
+                json.dumps({"email": user.email, "alternative_names": ["kuma.ai"]}),
+            ]
+        )
+    )
+    errors = tmp_path.joinpath("errors.jsonl")
+
+    call_command("issue_certificates", manifest, errors=errors, workers=1)
+
+    server = Server.objects.get(user=user)
+    assert list(server.alternative_names.flat_values("name")) == ["kuma.ai"]
+    assert [json.loads(line) for line in errors.read_text().splitlines()] == [
+        {"line": 1, "error": "The alternative names must be a list of strings"},
+        {"line": 2, "error": "The email must be a string"},
+        {"line": 3, "error": "The row is not valid JSON"},
+        {"line": 4, "error": "The row is not an object"},
+        {"line": 5, "error": "There are no alternative names"},
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_run_issuance_worker(user: User) -> None:
+    IssuanceJob.objects.bulk_create(
+        [
+            IssuanceJob(user=user, alternative_names=["kuma.ai"], max_attempts=3),
+            IssuanceJob(
+                user=user,
+                alternative_names=["api.kuma.ai"],
+                key_algorithm="ed25519",
+                max_attempts=3,
+            ),
+        ]
+    )
+
+    call_command("run_issuance_worker", burst=True)
+
+    assert set(IssuanceJob.objects.flat_values("status")) == {JobStatus.DONE}
+    assert Certificate.objects.filter(self_signed=False).count() == 2
+    assert OCSPResponse.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_find_servers(user: User) -> None:
+    server, _ = Server.objects.get_or_create_for_alt_names(user, ["*.kuma.ai"])
+    output = io.StringIO()
+
+    call_command("find_servers", "www.kuma.ai", stdout=output)
+
+    assert output.getvalue().splitlines() == [
+        f"*.kuma.ai\tserver {server.id}\tcertificate -",
+        "Found 1 names",
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_backfill_certificate_metadata(user: User) -> None:
+    for name in ["kuma.ai", "www.kuma.ai", "api.kuma.ai"]:
+        Server.objects.issue_for_alt_names(user, [name])
+    expected = {
+        certificate.id: certificate.fingerprint
+        for certificate in Certificate.objects.filter(self_signed=False)
+    }
+    Certificate.objects.update(
+        serial_number="",
+        not_valid_before=None,
+        not_valid_after=None,
+        fingerprint="",
+        issuer="",
+        alternative_names=[],
+    )
+    output = io.StringIO()
+
+    call_command("backfill_certificate_metadata", batch_size=2, stdout=output)
+
+    assert output.getvalue().splitlines()[-1] == "Filled 4 certificates, 0 failed"
+    assert not Certificate.objects.filter(fingerprint="").exists()
+    for certificate in Certificate.objects.filter(self_signed=False):
+        assert certificate.fingerprint == expected[certificate.id]
+        assert certificate.not_valid_after is not None
+        assert certificate.alternative_names
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_renew_expiring(user: User) -> None:
+    _, _, expiring = Server.objects.issue_for_alt_names(user, ["kuma.ai"])
+    _, _, revoked = Server.objects.issue_for_alt_names(user, ["api.kuma.ai"])
+    _, _, valid = Server.objects.issue_for_alt_names(user, ["www.kuma.ai"])
+    Revocation.objects.revoke(revoked, RevocationReason.KEY_COMPROMISE)
+    Certificate.objects.filter(id__in=[expiring.id, revoked.id]).update(
+        not_valid_after=now() + timedelta(days=1)
+    )
+    output = io.StringIO()
+
+    call_command("renew_expiring", workers=1, stdout=output)
+
+    assert (
+        output.getvalue()
+        .splitlines()[-1]
+        .startswith("Renewed 1 certificates, 0 failed")
+    )
+    renewed = Certificate.objects.get(id=expiring.id)
+    assert renewed.serial_number != expiring.serial_number
+    assert renewed.not_valid_after > now() + timedelta(days=365)
+    assert renewed.alternative_names == ["kuma.ai"]
+    assert OCSPResponse.objects.get(certificate=renewed).serial_number == (
+        renewed.serial_number
+    )
+    assert Certificate.objects.get(id=revoked.id).serial_number == (
+        revoked.serial_number
+    )
+    assert Certificate.objects.get(id=valid.id).serial_number == valid.serial_number
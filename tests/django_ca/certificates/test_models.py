@@ -0,0 +1,468 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+from cryptography import x509
+from pyutilkit.date_utils import now
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+
+from django_ca.certificates.models import (
+    Certificate,
+    CertificateRevocationList,
+    IssuanceJob,
+    JobStatus,
+    Key,
+    PooledKey,
+    Revocation,
+    Server,
+    ServerName,
+)
+from django_ca.certificates.utils import (
+    KeyAlgorithm,
+    RevocationReason,
+    ca_materials,
+    format_serial_number,
+    generate_key,
+)
+
+if TYPE_CHECKING:
+    from pytest_django import DjangoAssertNumQueries
+
+    from django_ca.accounts.models import User
+
+
+@pytest.mark.django_db
+def test_pop_from_empty_pool() -> None:
+    assert PooledKey.objects.pop(KeyAlgorithm.RSA) is None
+
+
+@pytest.mark.django_db
+def test_pop_from_pool() -> None:
+    PooledKey.objects.bulk_create(
+        [
+            PooledKey(private_key=b"first"),
+            PooledKey(algorithm=KeyAlgorithm.ED25519, private_key=b"ed25519"),
+            PooledKey(private_key=b"second"),
+        ]
+    )
+
+    assert PooledKey.objects.pop(KeyAlgorithm.RSA) == b"first"
+    stats = PooledKey.objects.get_stats(KeyAlgorithm.RSA)
+    assert stats.depth == 1
+    assert stats.refilled == 2
+    assert stats.consumed == 1
+    assert not PooledKey.objects.filter(private_key=b"first").exists()
+
+
+@pytest.mark.django_db
+def test_server_key_from_pool(server: Server) -> None:
+    PooledKey.objects.create(private_key=b"pooled")
+
+    with mock.patch(
+        "django_ca.certificates.models.generate_key", return_value=b"inline"
+    ) as generate:
+        key, created = Key.objects.get_or_create_server_key(server)
+
+    assert created is True
+    assert key.private_key == b"pooled"
+    generate.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_ca_key_is_not_pooled() -> None:
+    PooledKey.objects.create(algorithm=settings.CA_KEY_ALGORITHM, private_key=b"pooled")
+
+    call_command("create_ca")
+    call_command("create_ca_cert")
+
+    assert PooledKey.objects.available(settings.CA_KEY_ALGORITHM).exists()
+    assert Key.objects.get(server__certificate__self_signed=True).private_key != (
+        b"pooled"
+    )
+
+
+@pytest.mark.django_db
+def test_server_key_without_pool(server: Server) -> None:
+    with mock.patch(
+        "django_ca.certificates.models.generate_key", return_value=b"inline"
+    ) as generate:
+        key, created = Key.objects.get_or_create_server_key(server)
+
+    assert created is True
+    assert key.private_key == b"inline"
+    generate.assert_called_once_with(KeyAlgorithm.RSA)
+
+
+@pytest.mark.django_db
+def test_ca_material_is_cached(
+    ca_cert: Certificate, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    material = Certificate.objects.get_ca_material()
+
+    with django_assert_num_queries(0):
+        assert Certificate.objects.get_ca_material() is material
+
+    ca_cert.save()
+    assert ca_materials.active is None
+    assert Certificate.objects.get_ca_material() is not material
+
+
+@pytest.mark.django_db
+@override_settings(CA_MATERIAL_CHECK_PERIOD=timedelta(0))
+def test_ca_material_is_revalidated(
+    ca_cert: Certificate, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    material = Certificate.objects.get_ca_material()
+
+    with django_assert_num_queries(1):
+        assert Certificate.objects.get_ca_material() is material
+
+    # a rotation from another process does not send signals to this one
+    Key.objects.filter(server=ca_cert.server).update(private_key=generate_key())
+
+    assert Certificate.objects.get_ca_material() is not material
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_server_cert_without_csr(server: Server) -> None:
+    Key.objects.get_or_create_server_key(server)
+    certificate, created = Certificate.objects.get_or_create_server_cert(server)
+
+    assert created is True
+    assert certificate.csr == b""
+    csr = x509.load_der_x509_csr(certificate.get_csr())
+    assert (
+        csr.public_key()
+        == x509.load_der_x509_certificate(certificate.certificate).public_key()
+    )
+    updated_at = certificate.updated_at
+    certificate.refresh_from_db()
+    assert certificate.csr
+    assert certificate.updated_at == updated_at
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ca_algorithm", KeyAlgorithm.values)
+@pytest.mark.parametrize(
+    "algorithm",
+    [KeyAlgorithm.ECDSA_P256, KeyAlgorithm.ECDSA_P384, KeyAlgorithm.ED25519],
+)
+def test_server_cert_algorithms(
+    ca_algorithm: str, algorithm: KeyAlgorithm, server: Server
+) -> None:
+    with override_settings(CA_KEY_ALGORITHM=ca_algorithm):
+        call_command("create_ca")
+        call_command("create_ca_cert")
+    key, _ = Key.objects.get_or_create_server_key(server, algorithm)
+    certificate, _ = Certificate.objects.get_or_create_server_cert(server)
+
+    ca_cert = x509.load_der_x509_certificate(
+        Certificate.objects.get(self_signed=True).certificate
+    )
+    x509.load_der_x509_certificate(certificate.certificate).verify_directly_issued_by(
+        ca_cert
+    )
+    assert key.algorithm == algorithm
+    assert x509.load_der_x509_csr(certificate.get_csr()).is_signature_valid
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_issue_for_alt_names(user: User) -> None:
+    server, key, certificate = Server.objects.issue_for_alt_names(
+        user, ["kuma.ai", "www.kuma.ai"], KeyAlgorithm.ECDSA_P256
+    )
+
+    assert key.server == certificate.server == server
+    assert key.algorithm == KeyAlgorithm.ECDSA_P256
+    assert Server.objects.issue_for_alt_names(user, ["www.kuma.ai", "kuma.ai"]) == (
+        server,
+        key,
+        certificate,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_certificate_metadata(user: User) -> None:
+    _, _, certificate = Server.objects.issue_for_alt_names(
+        user, ["kuma.ai", "www.kuma.ai"], KeyAlgorithm.ECDSA_P256
+    )
+    certificate_object = x509.load_der_x509_certificate(certificate.certificate)
+
+    certificate.refresh_from_db()
+    assert certificate.serial_number == format_serial_number(
+        certificate_object.serial_number
+    )
+    assert certificate.not_valid_after == certificate_object.not_valid_after_utc
+    assert sorted(certificate.alternative_names) == ["kuma.ai", "www.kuma.ai"]
+    assert Certificate.objects.get(fingerprint=certificate.fingerprint) == certificate
+    assert (
+        Certificate.objects.filter(alternative_names__contains=["www.kuma.ai"]).get()
+        == certificate
+    )
+
+
+@pytest.mark.django_db
+def test_issuance_job_retries(user: User) -> None:
+    job = IssuanceJob.objects.create(
+        user=user, alternative_names=["kuma.ai"], max_attempts=2
+    )
+
+    claimed = IssuanceJob.objects.claim(timedelta(minutes=5))
+    assert claimed is not None
+    assert claimed == job
+    assert IssuanceJob.objects.claim(timedelta(minutes=5)) is None
+    claimed.run()
+    job.refresh_from_db()
+    assert job.status == JobStatus.PENDING
+    assert job.attempts == 1
+    assert job.run_after > now()
+    assert job.error
+
+    IssuanceJob.objects.filter(id=job.id).update(run_after=now())
+    claimed = IssuanceJob.objects.claim(timedelta(minutes=5))
+    assert claimed is not None
+    claimed.run()
+    job.refresh_from_db()
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 2
+    assert IssuanceJob.objects.claim(timedelta(minutes=5)) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_issuance_job_expired_lease(user: User) -> None:
+    job = IssuanceJob.objects.create(
+        user=user, alternative_names=["kuma.ai"], max_attempts=3
+    )
+    stale = IssuanceJob.objects.claim(timedelta(seconds=-1))
+    assert stale is not None
+
+    claimed = IssuanceJob.objects.claim(timedelta(minutes=5))
+    assert claimed is not None
+    assert claimed.attempts == 2
+    claimed.run()
+    stale.run()
+
+    job.refresh_from_db()
+    assert job.status == JobStatus.DONE
+    assert job.server is not None
+    assert job.server.certificate.certificate
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_base_and_delta_crl(user: User) -> None:
+    revoked = []
+    for name in ["kuma.ai", "api.kuma.ai", "www.kuma.ai"]:
+        _, _, certificate = Server.objects.issue_for_alt_names(user, [name])
+        revoked.append(certificate)
+    Revocation.objects.revoke(revoked[0], RevocationReason.KEY_COMPROMISE)
+    base = CertificateRevocationList.objects.generate_base()
+    Revocation.objects.revoke(revoked[1])
+
+    delta = CertificateRevocationList.objects.generate_delta()
+
+    base_crl = x509.load_der_x509_crl(bytes(base.der))
+    delta_crl = x509.load_der_x509_crl(bytes(delta.der))
+    assert base_crl.is_signature_valid(
+        Certificate.objects.get_ca_material().private_key.public_key()
+    )
+    assert [entry.serial_number for entry in base_crl] == [
+        x509.load_der_x509_certificate(revoked[0].certificate).serial_number
+    ]
+    assert [entry.serial_number for entry in delta_crl] == [
+        x509.load_der_x509_certificate(revoked[1].certificate).serial_number
+    ]
+    assert (
+        delta_crl.extensions.get_extension_for_class(
+            x509.DeltaCRLIndicator
+        ).value.crl_number
+        == base.number
+    )
+    assert delta.number == base.number + 1
+    with pytest.raises(ValueError, match="cannot be revoked"):
+        Revocation.objects.revoke(Certificate.objects.get(self_signed=True))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("ca_cert")
+def test_concurrent_crl_numbers() -> None:
+    barrier = threading.Barrier(4)
+
+    def generate() -> int:
+        barrier.wait()
+        try:
+            return CertificateRevocationList.objects.generate_base().number
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(4) as executor:
+        numbers = list(executor.map(lambda _: generate(), range(4)))
+
+    assert sorted(numbers) == [1, 2, 3, 4]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_server_listing(
+    user: User, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    expected = []
+    for names in [["kuma.ai", "api.kuma.ai"], ["www.kuma.ai"]]:
+        _, key, certificate = Server.objects.issue_for_alt_names(user, names)
+        expected.append((key.id, certificate.id, sorted(names)))
+    Server.objects.get_or_create_for_alt_names(user, ["new.kuma.ai"])
+
+    with django_assert_num_queries(1):
+        listing = list(Server.objects.get_listing(user))
+
+    assert [
+        (server["key_id"], server["cert_id"], server["names"]) for server in listing
+    ] == [*expected, (None, None, ["new.kuma.ai"])]
+
+
+@pytest.mark.django_db
+def test_display_names(
+    user: User, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    servers = Server.objects.bulk_create(
+        [
+            Server(
+                user=user,
+                organisation=user.default_organisation,
+                common_name=f"server-{index}",
+            )
+            for index in range(1000)
+        ]
+    )
+    ServerName.objects.bulk_create(
+        [
+            ServerName(server=server, name=name)
+            for server in servers[1:]
+            for name in [f"{server.common_name}.kuma.ai", "kuma.ai"]
+        ]
+    )
+    Key.objects.bulk_create([Key(server=server, private_key=b"") for server in servers])
+
+    with django_assert_num_queries(1):
+        names = [str(server) for server in Server.objects.with_display_names()]
+    with django_assert_num_queries(2):
+        prefetched = [
+            str(server)
+            for server in Server.objects.prefetch_related("alternative_names")
+        ]
+    with django_assert_num_queries(1):
+        key_names = [str(key) for key in Key.objects.with_display_names()]
+
+    assert sorted(names) == sorted(prefetched)
+    assert "server-0" in names
+    assert "kuma.ai, server-1.kuma.ai" in names
+    assert len(key_names) == 1000
+
+
+@pytest.mark.django_db
+def test_get_or_create_for_alt_names_queries(
+    user: User, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    names = [f"host-{index}.kuma.ai" for index in range(50)]
+
+    with django_assert_num_queries(5):
+        server, created = Server.objects.get_or_create_for_alt_names(user, names)
+    with django_assert_num_queries(1):
+        existing, existing_created = Server.objects.get_or_create_for_alt_names(
+            user, list(reversed(names))
+        )
+
+    assert created is True
+    assert existing_created is False
+    assert existing == server
+    assert server.alternative_names.count() == 50
+
+
+@pytest.mark.django_db(transaction=True)
+def test_get_or_create_for_alt_names_concurrently(user: User) -> None:
+    barrier = threading.Barrier(4)
+    inserted: list[int | None] = []
+    insert_if_absent = Server.objects._insert_if_absent  # noqa: SLF001
+
+    def insert(candidate: Server) -> int | None:
+        server_id = insert_if_absent(candidate)
+        inserted.append(server_id)
+        return server_id
+
+    def create() -> tuple[Server, bool]:
+        barrier.wait()
+        try:
+            return Server.objects.get_or_create_for_alt_names(user, ["kuma.ai"])
+        finally:
+            connection.close()
+
+    with (
+        mock.patch.object(Server.objects, "_insert_if_absent", side_effect=insert),
+        ThreadPoolExecutor(4) as executor,
+    ):
+        results = list(executor.map(lambda _: create(), range(4)))
+
+    winners = [server_id for server_id in inserted if server_id is not None]
+    assert len(winners) == 1
+    assert {server.id for server, _ in results} == set(winners)
+    assert [server.id for server, created in results if created] == winners
+    assert ServerName.objects.count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("method", "query", "expected"),
+    [
+        ("exact", "API.kuma.ai", ["api.kuma.ai"]),
+        ("covering", "www.kuma.ai", ["*.kuma.ai"]),
+        ("covering", "api.kuma.ai", ["*.kuma.ai", "api.kuma.ai"]),
+        ("wildcard", "*.kuma.ai", ["*.kuma.ai", "api.kuma.ai"]),
+        (
+            "under",
+            "kuma.ai",
+            ["*.kuma.ai", "api.kuma.ai", "kuma.ai", "v1.api.kuma.ai"],
+        ),
+    ],
+)
+def test_server_name_lookups(
+    user: User, method: str, query: str, expected: list[str]
+) -> None:
+    Server.objects.get_or_create_for_alt_names(
+        user,
+        ["kuma.ai", "*.kuma.ai", "api.kuma.ai", "v1.api.kuma.ai", "kuma.ai.evil.com"],
+    )
+    Server.objects.get_or_create_for_alt_names(user, ["notkuma.ai"])
+
+    names = getattr(ServerName.objects, method)(query).flat_values("name")
+
+    assert sorted(names) == expected
+
+
+@pytest.mark.django_db
+def test_server_names_are_lowercased(user: User) -> None:
+    server, _ = Server.objects.get_or_create_for_alt_names(
+        user, ["API.Kuma.ai", "api.kuma.ai", "*.Kuma.AI"]
+    )
+
+    assert sorted(server.alternative_names.flat_values("name")) == [
+        "*.kuma.ai",
+        "api.kuma.ai",
+    ]
+    assert ServerName.objects.exact("Api.Kuma.Ai").get().server == server
+    assert ServerName.objects.under("KUMA.ai").count() == 2
+    assert Server.objects.get_or_create_for_alt_names(
+        user, ["api.kuma.ai", "*.kuma.ai"]
+    ) == (server, False)
@@ -0,0 +1,95 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+
+from django_ca.certificates.models import Certificate
+from django_ca.certificates.utils import (
+    CAMaterialCache,
+    PEMLabel,
+    der_to_pem,
+    generate_certificate,
+    generate_csr,
+    generate_key,
+    sign_csr,
+)
+
+if TYPE_CHECKING:
+    from django_ca.certificates.types import SubjectInfo
+
+
+@pytest.mark.django_db
+def test_ca_material_cache(ca_cert: Certificate) -> None:
+    cache = CAMaterialCache()
+    private_key = ca_cert.server.key.private_key
+
+    material = cache.get(ca_cert.certificate, private_key)
+
+    assert cache.get(ca_cert.certificate, private_key) is material
+    assert material.certificate.subject == material.certificate.issuer
+    cache.clear()
+    assert cache.get(ca_cert.certificate, private_key) is not material
+
+
+@pytest.mark.django_db
+def test_sign_csr_matches_direct_issuance(ca_cert: Certificate) -> None:
+    material = CAMaterialCache().get(
+        ca_cert.certificate, ca_cert.server.key.private_key
+    )
+    private_key = generate_key()
+    alternative_names = ["kuma.ai", "www.kuma.ai"]
+    subject: SubjectInfo = {
+        "country": "GB",
+        "province": "England",
+        "locality": "London",
+        "organisation": "Cyberdyne Systems",
+        "email_address": "serena.kogan@skynet.org",
+    }
+
+    csr = generate_csr(
+        **subject,
+        common_name="kuma",
+        alternative_names=alternative_names,
+        private_key=private_key,
+    )
+    signed = x509.load_der_x509_certificate(sign_csr(csr, material))
+    direct = x509.load_der_x509_certificate(
+        generate_certificate(
+            **subject,
+            common_name="kuma",
+            alternative_names=alternative_names,
+            private_key=private_key,
+            ca_material=material,
+        )
+    )
+
+    assert direct.subject == signed.subject
+    assert direct.issuer == signed.issuer == material.certificate.subject
+    assert direct.public_key() == signed.public_key()
+    for certificate in (direct, signed):
+        assert (
+            certificate.extensions.get_extension_for_class(
+                x509.SubjectAlternativeName
+            ).value.get_values_for_type(x509.DNSName)
+            == alternative_names
+        )
+
+
+@pytest.mark.django_db
+def test_der_to_pem(ca_cert: Certificate) -> None:
+    certificate = x509.load_der_x509_certificate(ca_cert.certificate)
+    private_key = serialization.load_der_private_key(
+        ca_cert.server.key.private_key, password=None
+    )
+
+    assert der_to_pem(ca_cert.certificate, PEMLabel.CERTIFICATE) == (
+        certificate.public_bytes(serialization.Encoding.PEM).decode()
+    )
+    assert der_to_pem(ca_cert.server.key.private_key, PEMLabel.PRIVATE_KEY) == (
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ).decode()
+    )
@@ -0,0 +1,359 @@
+import io
+import json
+import tarfile
+from datetime import timedelta
+from typing import TYPE_CHECKING, cast
+
+import pytest
+from asgiref.sync import sync_to_async
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.test import AsyncClient, AsyncRequestFactory, override_settings
+from django.urls import reverse
+
+from django_ca.accounts.models import User
+from django_ca.certificates.models import Certificate, CertificateRevocationList, Server
+from django_ca.certificates.utils import PEMLabel, ca_materials, der_to_pem
+from django_ca.certificates.views import (
+    ServerBundleView,
+    ServerListView,
+    UserServerView,
+)
+from django_ca.lib.middleware import JWTAuthenticationMiddleware
+from django_ca.lib.utils import JWT
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from django_ca.lib.types import JSONDict
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_download_certificate(ca_cert: Certificate) -> None:
+    url = reverse(
+        "certificates:certificate",
+        kwargs={"obj_id": ca_cert.oid, "field": "certificate", "filename": "ca.crt"},
+    )
+
+    response = await AsyncClient().get(url)
+
+    assert response.status_code == 200
+    assert (
+        x509.load_pem_x509_certificate(response.content).public_bytes(
+            serialization.Encoding.DER
+        )
+        == ca_cert.certificate
+    )
+    assert response["Content-Disposition"] == "attachment; filename=ca.crt"
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_download_missing_certificate() -> None:
+    url = reverse(
+        "certificates:certificate",
+        kwargs={"obj_id": 1, "field": "certificate", "filename": "ca.crt"},
+    )
+
+    response = await AsyncClient().get(url)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("ca_cert")
+async def test_download_crl() -> None:
+    assert (await AsyncClient().get(reverse("certificates:crl"))).status_code == 404
+    crl = await sync_to_async(CertificateRevocationList.objects.generate_base)()
+
+    response = await AsyncClient().get(reverse("certificates:crl"))
+    pem_response = await AsyncClient().get(reverse("certificates:crl_pem"))
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/pkix-crl"
+    assert response.content == bytes(crl.der)
+    assert pem_response.content.decode() == crl.pem
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_download_certificate_not_modified(ca_cert: Certificate) -> None:
+    url = reverse(
+        "certificates:certificate",
+        kwargs={"obj_id": ca_cert.oid, "field": "certificate", "filename": "ca.crt"},
+    )
+    response = await AsyncClient().get(url)
+    assert response["Cache-Control"].startswith("public, max-age=")
+
+    not_modified = await AsyncClient().get(
+        url, headers={"If-None-Match": response["ETag"]}
+    )
+
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified["ETag"] == response["ETag"]
+
+    await sync_to_async(ca_cert.save)()
+    modified = await AsyncClient().get(url, headers={"If-None-Match": response["ETag"]})
+
+    assert modified.status_code == 200
+    assert modified.content.decode() == der_to_pem(
+        ca_cert.certificate, PEMLabel.CERTIFICATE
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_download_unknown_field(ca_cert: Certificate) -> None:
+    url = reverse(
+        "certificates:certificate",
+        kwargs={"obj_id": ca_cert.oid, "field": "server_id", "filename": "ca.crt"},
+    )
+
+    response = await AsyncClient().get(url)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("ca_cert")
+async def test_download_bundle(user: User) -> None:
+    for name in ["kuma.ai", "api.kuma.ai"]:
+        await sync_to_async(Server.objects.issue_for_alt_names)(user, [name])
+    request = AsyncRequestFactory().get(reverse("certificates:bundle"))
+
+    async def auser() -> User:
+        return user
+
+    request.auser = auser
+    response = await ServerBundleView().get(request)
+
+    assert isinstance(response, StreamingHttpResponse)
+    assert response["Content-Type"] == "application/x-tar"
+    assert response.is_async
+    content = b"".join(
+        [
+            chunk
+            async for chunk in cast("AsyncIterator[bytes]", response.streaming_content)
+        ]
+    )
+    with tarfile.open(fileobj=io.BytesIO(content)) as tar:
+        names = tar.getnames()
+        key_info = tar.getmember(names[1])
+        key_file = tar.extractfile(key_info)
+        assert key_file is not None
+        serialization.load_pem_private_key(key_file.read(), password=None)
+    assert len(names) == 5
+    assert names[0] == f"{settings.CA_NAME}.crt"
+    assert key_info.name.endswith("/server.key")
+    assert key_info.mode == 0o600
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_ca_certificate_id_is_cached(ca_cert: Certificate) -> None:
+    assert await Certificate.objects.aget_ca_certificate_id() == ca_cert.id
+    assert ca_materials.certificate_id == ca_cert.id
+
+    await sync_to_async(ca_cert.save)()
+
+    assert ca_materials.certificate_id is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_ca_certificate_id_expires(ca_cert: Certificate) -> None:
+    with override_settings(CA_MATERIAL_CHECK_PERIOD=timedelta(0)):
+        assert await Certificate.objects.aget_ca_certificate_id() == ca_cert.id
+
+        # a deletion from another process does not send signals to this one
+        await Certificate.objects.filter(id=ca_cert.id).adelete()
+
+        with pytest.raises(Certificate.DoesNotExist):
+            await Certificate.objects.aget_ca_certificate_id()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_server_list_pages(user: User) -> None:
+    for index in range(5):
+        await sync_to_async(Server.objects.get_or_create_for_alt_names)(
+            user, [f"host-{index}.kuma.ai"]
+        )
+
+    async def auser() -> User:
+        return user
+
+    names: list[str] = []
+    server_oids: list[int] = []
+    cursor = None
+    for _ in range(3):
+        query = {"page_size": "2"} | ({} if cursor is None else {"cursor": cursor})
+        request = AsyncRequestFactory().get(reverse("certificates:list"), query)
+        request.auser = auser
+        response = await ServerListView().get(request)
+        data = json.loads(response.content)
+        names.extend(name for server in data["servers"] for name in server["names"])
+        server_oids.extend(server["server_id"] for server in data["servers"])
+        cursor = data["next"]
+
+    assert names == [f"host-{index}.kuma.ai" for index in range(5)]
+    assert cursor is None
+    assert [
+        server.oid
+        async for server in Server.objects.filter(user=user).order_by("created_at")
+    ] == server_oids
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_server_list_invalid_cursor(user: User) -> None:
+    async def auser() -> User:
+        return user
+
+    request = AsyncRequestFactory().get(
+        reverse("certificates:list"), {"cursor": "garbage"}
+    )
+    request.auser = auser
+    response = await ServerListView().get(request)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_issue_unknown_key_algorithm(user: User) -> None:
+    response = await AsyncClient().post(
+        reverse("certificates:issue"),
+        {"alternative_names": ["kuma.ai"], "key_algorithm": "dsa"},
+        content_type="application/json",
+        headers={"Authorization": f"Bearer {JWT.for_user(user, 'access')}"},
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {"error": "Unknown key algorithm"}
+    assert not await Server.objects.filter(user=user).aexists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("ca_cert")
+@override_settings(OPTIMUS_RANDOM=0x5A5A)
+async def test_server_list_encodes_ids(user: User) -> None:
+    _, key, certificate = await sync_to_async(Server.objects.issue_for_alt_names)(
+        user, ["kuma.ai"]
+    )
+
+    async def auser() -> User:
+        return user
+
+    request = AsyncRequestFactory().get(reverse("certificates:list"))
+    request.auser = auser
+    response = await ServerListView().get(request)
+    [server] = json.loads(response.content)["servers"]
+
+    assert server["key_id"] == key.oid != key.id
+    assert server["cert_id"] == certificate.oid != certificate.id
+    url = reverse(
+        "certificates:certificate",
+        kwargs={
+            "obj_id": server["cert_id"],
+            "field": "certificate",
+            "filename": "a.crt",
+        },
+    )
+    download = await AsyncClient().get(url)
+    assert download.status_code == 200
+    assert download.content.decode() == der_to_pem(
+        certificate.certificate, PEMLabel.CERTIFICATE
+    )
+
+
+def _bearer(user: User) -> dict[str, str]:
+    return {"Authorization": f"Bearer {JWT.for_user(user, 'access')}"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    ("method", "name", "kwargs"),
+    [
+        ("post", "certificates:issue", {}),
+        ("get", "certificates:bundle", {}),
+        ("post", "certificates:jobs", {}),
+        ("get", "certificates:job_status", {"job_id": 1}),
+    ],
+)
+async def test_anonymous_requests_are_rejected(
+    method: str, name: str, kwargs: dict[str, int]
+) -> None:
+    client = AsyncClient()
+    response = await getattr(client, method)(
+        reverse(name, kwargs=kwargs),
+        {"alternative_names": ["kuma.ai"]},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("ca_cert")
+async def test_issue_and_list_servers(user: User) -> None:
+    response = await AsyncClient().post(
+        reverse("certificates:issue"),
+        {"alternative_names": ["kuma.ai"]},
+        content_type="application/json",
+        headers=_bearer(user),
+    )
+
+    assert response.status_code == 201
+    certificate = await Certificate.objects.aget(server__user=user)
+    assert response.json()["cert_id"] == certificate.oid
+
+    listing = await AsyncClient().get(
+        reverse("certificates:list"), headers=_bearer(user)
+    )
+    assert [server["names"] for server in listing.json()["servers"]] == [["kuma.ai"]]
+
+    contexts: list[JSONDict] = []
+
+    async def render(request: HttpRequest) -> HttpResponse:
+        view = UserServerView()
+        view.setup(request)
+        contexts.append(await view.aget_context_data())
+        return HttpResponse()
+
+    request = AsyncRequestFactory().get(reverse("certificates:server"))
+    request.META["HTTP_AUTHORIZATION"] = _bearer(user)["Authorization"]
+    await JWTAuthenticationMiddleware(render)(request)
+    servers = cast("list[JSONDict]", contexts[0]["servers"])
+    assert [server["names"] for server in servers] == [["kuma.ai"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_issuance_job_status(user: User) -> None:
+    response = await AsyncClient().post(
+        reverse("certificates:jobs"),
+        {"alternative_names": ["kuma.ai"]},
+        content_type="application/json",
+        headers=_bearer(user),
+    )
+
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    status = await AsyncClient().get(
+        reverse("certificates:job_status", kwargs={"job_id": job_id}),
+        headers=_bearer(user),
+    )
+    assert status.status_code == 200
+    assert status.json()["job_id"] == job_id
+    assert status.json()["status"] == response.json()["status"]
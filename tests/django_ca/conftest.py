@@ -0,0 +1,57 @@
+from collections.abc import Iterator
+
+import pytest
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+
+from django_ca.accounts.models import User
+from django_ca.certificates.models import Certificate, Server
+from django_ca.certificates.utils import ca_materials
+from django_ca.lib.auth import verified_tokens
+from django_ca.lib.cache import cache_stats
+
+
+@pytest.fixture(autouse=True)
+def _small_keys() -> Iterator[None]:
+    with override_settings(RSA_KEY_SIZE=2048):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _clear_ca_materials() -> Iterator[None]:
+    yield
+    ca_materials.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_auth_caches() -> Iterator[None]:
+    yield
+    verified_tokens.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches() -> Iterator[None]:
+    yield
+    cache.clear()
+    cache_stats.clear()
+
+
+@pytest.fixture
+def user() -> User:
+    return User.objects.create_user(email="carl.sagan@kuma.ai")
+
+
+@pytest.fixture
+def server(user: User) -> Server:
+    server, _ = Server.objects.get_or_create_for_alt_names(user, ["kuma.ai"])
+    return server
+
+
+@pytest.fixture
+def ca_cert() -> Certificate:
+    call_command("create_ca")
+    call_command("create_ca_cert")
+    ca_cert: Certificate = Certificate.objects.get(self_signed=True)
+    return ca_cert
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+from unittest import mock
+
+import pytest
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import reverse
+
+from django_ca.accounts.models import User
+from django_ca.lib import auth
+from django_ca.lib.cache import make_key
+from django_ca.lib.utils import JWT
+
+if TYPE_CHECKING:
+    from pytest_django import DjangoAssertNumQueries
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    ("scheme", "token_type", "status"),
+    [("Bearer", "access", 200), ("Bearer", "refresh", 401), ("Basic", "access", 401)],
+)
+async def test_bearer_authentication(
+    user: User, scheme: str, token_type: Literal["access", "refresh"], status: int
+) -> None:
+    token = JWT.for_user(user, token_type)
+
+    response = await AsyncClient().get(
+        reverse("certificates:list"), headers={"Authorization": f"{scheme} {token}"}
+    )
+
+    assert response.status_code == status
+
+
+def test_invalid_token() -> None:
+    assert auth.get_token_email("invalid") is None
+
+
+def test_verified_tokens_are_cached() -> None:
+    token = str(JWT(sub="access", email="carl.sagan@kuma.ai", exp=2**32))
+
+    with mock.patch.object(JWT, "from_token", wraps=JWT.from_token) as decode:
+        assert auth.get_token_email(token) == "carl.sagan@kuma.ai"
+        assert auth.get_token_email(token) == "carl.sagan@kuma.ai"
+
+    decode.assert_called_once_with(token)
+
+
+@pytest.mark.django_db
+def test_active_users_are_cached(
+    user: User, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    with django_assert_num_queries(1):
+        assert auth.get_user(user.email) == user
+        assert auth.get_user(user.email) == user
+
+    user.is_active = False
+    user.save()
+
+    assert isinstance(auth.get_user(user.email), AnonymousUser)
+
+
+@pytest.mark.django_db
+def test_cached_users_exclude_the_password(user: User) -> None:
+    auth.get_user(user.email)
+
+    values = cache.get(make_key(auth.USER_CACHE, user.email))
+    assert user.password not in values
+    cached = auth.get_user(user.email)
+    assert isinstance(cached, User)
+    assert cached == user
+    assert "password" in cached.get_deferred_fields()
+
+
+@pytest.mark.django_db
+def test_email_change_invalidates_the_previous_email(user: User) -> None:
+    email = user.email
+    assert auth.get_user(email) == user
+
+    user.email = "ann.druyan@kuma.ai"
+    user.save()
+
+    assert isinstance(auth.get_user(email), AnonymousUser)
+    assert auth.get_user(user.email) == user
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from asgiref.sync import sync_to_async
+
+from django.test import Client
+from django.urls import reverse
+
+from django_ca.accounts.models import DEFAULT_ORGANISATION_CACHE, Organisation
+from django_ca.certificates.models import CERTIFICATE_CACHE, Certificate
+from django_ca.lib.cache import cache_stats, get_or_set
+
+if TYPE_CHECKING:
+    from pytest_django import DjangoAssertNumQueries
+
+
+def test_get_or_set_counts_hits_and_misses() -> None:
+    assert get_or_set("test", "key", lambda: None) is None
+    assert get_or_set("test", "key", lambda: 1) is None
+
+    stats = cache_stats["test"]
+    assert (stats.hits, stats.misses, stats.hit_ratio) == (1, 1, 0.5)
+
+
+@pytest.mark.django_db
+def test_default_organisation_is_cached(
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    organisation, created = Organisation.objects.get_or_create_default_org(for_ca=False)
+    assert created
+
+    with django_assert_num_queries(0):
+        assert Organisation.objects.get_or_create_default_org(for_ca=False) == (
+            organisation,
+            False,
+        )
+
+    organisation.name = "Skynet"
+    organisation.save()
+
+    cached, _ = Organisation.objects.get_or_create_default_org(for_ca=False)
+    assert cached.name == "Skynet"
+    assert cache_stats[DEFAULT_ORGANISATION_CACHE].misses == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_ca_certificate_is_cached(ca_cert: Certificate) -> None:
+    assert await Certificate.objects.aget_ca_certificate() == ca_cert
+    assert await Certificate.objects.aget_ca_certificate() == ca_cert
+    assert cache_stats[CERTIFICATE_CACHE].hits == 1
+
+    await sync_to_async(ca_cert.delete)()
+
+    assert await Certificate.objects.aget_ca_certificate() is None
+
+
+@pytest.mark.django_db
+def test_cache_stats_view() -> None:
+    Organisation.objects.get_or_create_default_org(for_ca=True)
+
+    response = Client().get(reverse("cache_stats"))
+
+    assert response.status_code == 200
+    assert response.json()[DEFAULT_ORGANISATION_CACHE] == {
+        "hits": 0,
+        "misses": 1,
+        "hit_ratio": 0,
+    }
@@ -0,0 +1,49 @@
+from unittest import mock
+
+import pytest
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from django_ca.lib import views
+from django_ca.lib.db import get_pool_stats
+
+requires_pool = pytest.mark.skipif(
+    not settings.DB_POOL, reason="Connection pooling is disabled"
+)
+
+
+@requires_pool
+@pytest.mark.django_db
+def test_pool_stats() -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+    stats = get_pool_stats()
+
+    assert stats is not None
+    assert stats.max_size == connection.settings_dict["OPTIONS"]["pool"]["max_size"]
+    assert 0 < stats.in_use <= stats.size
+    assert 0 < stats.saturation <= 1
+
+
+@requires_pool
+@pytest.mark.django_db
+def test_pool_status_view() -> None:
+    response = Client().get(reverse("database_pool"))
+
+    assert response.status_code == 200
+    assert (
+        response.json()["max_size"]
+        == connection.settings_dict["OPTIONS"]["pool"]["max_size"]
+    )
+
+
+def test_pool_status_view_without_pool() -> None:
+    with mock.patch.object(views, "get_pool_stats", return_value=None):
+        response = Client().get(reverse("database_pool"))
+
+    assert response.status_code == 404
+    assert response.json() == {"error": "Connection pooling is disabled"}
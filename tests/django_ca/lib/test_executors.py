@@ -0,0 +1,36 @@
+import asyncio
+from threading import Event
+
+import pytest
+
+from django_ca.lib.executors import BoundedExecutor, ExecutorFullError
+
+
+@pytest.mark.asyncio
+async def test_run() -> None:
+    executor = BoundedExecutor("test", max_workers=2, max_queue=2)
+
+    assert await executor.run(pow, 2, 10) == 1024
+    stats = executor.get_stats()
+    assert stats.running == 0
+    assert stats.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_run_when_full() -> None:
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = Event()
+
+    running = asyncio.create_task(executor.run(release.wait))
+    queued = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.1)
+
+    stats = executor.get_stats()
+    assert stats.running == 1
+    assert stats.queued == 1
+    with pytest.raises(ExecutorFullError):
+        await executor.run(release.wait)
+
+    release.set()
+    assert await running is True
+    assert await queued is True
@@ -0,0 +1,147 @@
+from ipaddress import ip_network
+from typing import TYPE_CHECKING, cast
+
+import pytest
+
+from django.http import StreamingHttpResponse
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from django_ca.accounts.models import User
+from django_ca.certificates.models import Key, Server
+from django_ca.certificates.utils import generate_key
+from django_ca.lib.metrics import Counter, Histogram, Registry, registry, track_queries
+from django_ca.lib.utils import JWT
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+def get_sample(sample: str) -> float:
+    for line in registry.render().splitlines():
+        name, _, value = line.rpartition(" ")
+        if name == sample:
+            return float(value)
+    return 0
+
+
+def test_render() -> None:
+    test_registry = Registry()
+    requests = Counter("requests_total", "Requests", ("path",), registry=test_registry)
+    latency = Histogram(
+        "latency_seconds", "Latency", buckets=(0.1, 1), registry=test_registry
+    )
+
+    requests.inc(path='/"quoted"')
+    requests.inc(2, path='/"quoted"')
+    latency.observe(0.5)
+
+    assert test_registry.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 0',
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="+Inf"} 1',
+        "latency_seconds_sum 0.5",
+        "latency_seconds_count 1",
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{path="/\\"quoted\\""} 3',
+    ]
+
+
+def test_metric_names_are_unique() -> None:
+    test_registry = Registry()
+    Counter("requests_total", "Requests", registry=test_registry)
+
+    with pytest.raises(ValueError, match="already registered"):
+        Counter("requests_total", "Requests", registry=test_registry)
+
+
+def test_labels_are_validated() -> None:
+    requests = Counter("requests_total", "Requests", ("path",), registry=Registry())
+
+    with pytest.raises(ValueError, match="expects the labels"):
+        requests.inc(method="GET")
+
+
+@pytest.mark.django_db
+def test_queries_are_tracked() -> None:
+    with track_queries() as queries:
+        User.objects.count()
+        User.objects.exists()
+
+    assert queries.count == 2
+    assert queries.seconds > 0
+
+
+def test_crypto_operations_are_timed() -> None:
+    sample = 'dj_ca_crypto_seconds_count{operation="generate_key"}'
+    before = get_sample(sample)
+
+    generate_key()
+
+    assert get_sample(sample) == before + 1
+
+
+@pytest.mark.django_db
+def test_issued_keys_are_counted(server: Server) -> None:
+    sample = 'dj_ca_keys_issued_total{source="generated"}'
+    before = get_sample(sample)
+
+    Key.objects.get_or_create_server_key(server)
+    Key.objects.get_or_create_server_key(server)
+
+    assert get_sample(sample) == before + 1
+
+
+@pytest.mark.django_db
+def test_metrics_view() -> None:
+    Client().get(reverse("cache_stats"))
+
+    response = Client().get(reverse("metrics"))
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.content.decode()
+    assert (
+        'dj_ca_request_seconds_count{view="cache_stats",method="GET",status="200"}'
+        in text
+    )
+    assert 'dj_ca_executor_tasks{state="running"} 0' in text
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("ca_cert")
+async def test_streamed_queries_are_tracked(user: User) -> None:
+    sample = 'dj_ca_request_queries_count{view="certificates:bundle"}'
+    before = get_sample(sample)
+
+    response = await AsyncClient().get(
+        reverse("certificates:bundle"),
+        headers={"Authorization": f"Bearer {JWT.for_user(user, 'access')}"},
+    )
+
+    assert isinstance(response, StreamingHttpResponse)
+    assert get_sample(sample) == before
+    async for _ in cast("AsyncIterator[bytes]", response.streaming_content):
+        pass
+    assert get_sample(sample) == before + 1
+    assert get_sample('dj_ca_request_queries_sum{view="certificates:bundle"}') > 0
+
+
+@pytest.mark.parametrize(
+    "name", ["metrics", "cache_stats", "database_pool", "certificates:executor_status"]
+)
+def test_status_views_are_restricted(name: str) -> None:
+    response = Client(REMOTE_ADDR="203.0.113.7").get(reverse(name))
+
+    assert response.status_code == 403
+
+
+def test_status_views_allow_configured_networks() -> None:
+    with override_settings(STATUS_ALLOWED_NETWORKS=[ip_network("203.0.113.0/24")]):
+        response = Client(REMOTE_ADDR="203.0.113.7").get(reverse("metrics"))
+
+    assert response.status_code == 200
@@ -0,0 +1,16 @@
+import pytest
+from pyutilkit.date_utils import now
+
+from django_ca.lib.pagination import Cursor
+
+
+def test_cursor_round_trip() -> None:
+    cursor = Cursor(created_at=now(), id=42)
+
+    assert Cursor.from_string(str(cursor)) == cursor
+
+
+@pytest.mark.parametrize("raw", ["", "garbage", "bm90LWEtZGF0ZXw0Mg=="])
+def test_invalid_cursor(raw: str) -> None:
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        Cursor.from_string(raw)
@@ -0,0 +1,110 @@
+from collections.abc import AsyncIterator, Iterator
+from typing import cast
+
+import pytest
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBase,
+    StreamingHttpResponse,
+)
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from django_ca.accounts.models import User
+from django_ca.lib.middleware import ReplicaMiddleware
+from django_ca.lib.routers import (
+    REPLICA_DATABASE,
+    ReplicaRouter,
+    database_state,
+    replica_reads,
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def replica() -> Iterator[str]:
+    connections.settings[REPLICA_DATABASE] = {
+        **connections[DEFAULT_DB_ALIAS].settings_dict,
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {},
+    }
+    yield REPLICA_DATABASE
+    connections[REPLICA_DATABASE].close()
+    del connections[REPLICA_DATABASE]
+    del connections.settings[REPLICA_DATABASE]
+
+
+@pytest.mark.django_db(transaction=True, databases=[DEFAULT_DB_ALIAS, REPLICA_DATABASE])
+def test_reads_stay_on_primary_after_a_write() -> None:
+    with replica_reads() as state:
+        with CaptureQueriesContext(connections[REPLICA_DATABASE]) as replica_queries:
+            assert not User.objects.filter(email="replica@example.com").exists()
+        assert len(replica_queries) == 1
+
+        User.objects.create_user(email="replica@example.com")
+        assert state.pinned
+
+        with CaptureQueriesContext(connections[REPLICA_DATABASE]) as replica_queries:
+            assert User.objects.filter(email="replica@example.com").exists()
+        assert len(replica_queries) == 0
+
+
+def test_router_reads_from_primary_outside_read_only_scopes() -> None:
+    assert ReplicaRouter.db_for_read(User) is None
+    with replica_reads(enabled=False):
+        assert ReplicaRouter.db_for_read(User) is None
+    with replica_reads():
+        assert ReplicaRouter.db_for_read(User) == REPLICA_DATABASE
+    assert ReplicaRouter.db_for_write(User) == DEFAULT_DB_ALIAS
+    assert not ReplicaRouter.allow_migrate(REPLICA_DATABASE, "accounts")
+
+
+@pytest.mark.asyncio
+async def test_middleware_pins_writers_to_primary() -> None:
+    databases: list[str | None] = []
+
+    async def read(_request: HttpRequest) -> HttpResponseBase:
+        databases.append(ReplicaRouter.db_for_read(User))
+        return HttpResponse()
+
+    async def write(_request: HttpRequest) -> HttpResponseBase:
+        ReplicaRouter.db_for_write(User)
+        return HttpResponse()
+
+    factory = RequestFactory()
+    await ReplicaMiddleware(read)(factory.get("/"))
+    response = await ReplicaMiddleware(write)(factory.post("/"))
+    request = factory.get("/")
+    request.COOKIES = {
+        settings.REPLICA_PIN_COOKIE: response.cookies[settings.REPLICA_PIN_COOKIE].value
+    }
+    await ReplicaMiddleware(read)(request)
+
+    assert databases == [REPLICA_DATABASE, None]
+    assert database_state.get() is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_keeps_the_replica_while_streaming() -> None:
+    databases: list[str | None] = []
+
+    async def stream() -> AsyncIterator[bytes]:
+        databases.append(ReplicaRouter.db_for_read(User))
+        yield b""
+
+    async def view(_request: HttpRequest) -> HttpResponseBase:
+        return StreamingHttpResponse(stream())
+
+    response = await ReplicaMiddleware(view)(RequestFactory().get("/"))
+    assert isinstance(response, StreamingHttpResponse)
+    assert database_state.get() is None
+
+    assert [
+        chunk
+        async for chunk in cast("AsyncIterator[bytes]", response.streaming_content)
+    ] == [b""]
+    assert databases == [REPLICA_DATABASE]
+    assert database_state.get() is None
@@ -31,3 +31,22 @@ def test_hash_migrations() -> None:
         hashed_migrations[app].append(name)
     assert "accounts" in hashed_migrations
     assert "0001_initial" in hashed_migrations["accounts"]
+
+
+def test_optimus_many() -> None:
+    optimus = utils.get_optimus()
+    numbers = [1, 2, 3, 2**40, 2**62]
+
+    encoded = optimus.encode_many(numbers)
+
+    assert encoded == [optimus.encode(n) for n in numbers]
+    assert optimus.decode_many(encoded) == numbers
+
+
+def test_optimus_is_reused() -> None:
+    optimus = utils.get_optimus()
+
+    assert utils.get_optimus() is optimus
+    with override_settings(OPTIMUS_RANDOM=optimus.random + 1):
+        assert utils.get_optimus().random == optimus.random + 1
+    assert utils.get_optimus().random == optimus.random
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+import pytest
+from pyutilkit.date_utils import now
+
+from django_ca.certificates.models import Certificate, Key, Server
+from django_ca.ocsp.models import OCSPResponse
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("ca_cert")
+def test_refresh_stale(server: Server) -> None:
+    Key.objects.get_or_create_server_key(server)
+    Certificate.objects.get_or_create_server_cert(server)
+
+    assert OCSPResponse.objects.refresh_stale(batch_size=10) == 0
+
+    OCSPResponse.objects.update(next_update=now() + timedelta(minutes=1))
+    assert OCSPResponse.objects.refresh_stale(batch_size=10) == 1
+    assert OCSPResponse.objects.get().next_update > now() + timedelta(hours=1)
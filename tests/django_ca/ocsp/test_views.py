@@ -0,0 +1,140 @@
+import base64
+import json
+from pathlib import Path
+
+import pytest
+from asgiref.sync import sync_to_async
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.x509 import ocsp
+
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+
+from django_ca.accounts.models import User
+from django_ca.certificates.models import Certificate, Key, Revocation, Server
+from django_ca.certificates.utils import RevocationReason
+from django_ca.ocsp.models import OCSPResponse
+
+
+def _build_request(certificate: Certificate, ca_cert: Certificate) -> bytes:
+    return (
+        ocsp.OCSPRequestBuilder()
+        .add_certificate(
+            x509.load_der_x509_certificate(certificate.certificate),
+            x509.load_der_x509_certificate(ca_cert.certificate),
+            hashes.SHA1(),  # noqa: S303
+        )
+        .build()
+        .public_bytes(serialization.Encoding.DER)
+    )
+
+
+@pytest.fixture
+def certificate(ca_cert: Certificate, server: Server) -> Certificate:  # noqa: ARG001
+    Key.objects.get_or_create_server_key(server)
+    certificate, _ = Certificate.objects.get_or_create_server_cert(server)
+    return certificate
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_ocsp_post(ca_cert: Certificate, certificate: Certificate) -> None:
+    response = await AsyncClient().post(
+        reverse("ocsp:post"),
+        _build_request(certificate, ca_cert),
+        content_type="application/ocsp-request",
+    )
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/ocsp-response"
+    ocsp_response = ocsp.load_der_ocsp_response(response.content)
+    assert ocsp_response.response_status == ocsp.OCSPResponseStatus.SUCCESSFUL
+    assert ocsp_response.certificate_status == ocsp.OCSPCertStatus.GOOD
+    assert ocsp_response.serial_number == (
+        x509.load_der_x509_certificate(certificate.certificate).serial_number
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_ocsp_get(ca_cert: Certificate, certificate: Certificate) -> None:
+    encoded_request = base64.b64encode(_build_request(certificate, ca_cert)).decode()
+
+    response = await AsyncClient().get(
+        reverse("ocsp:get", kwargs={"encoded_request": encoded_request})
+    )
+
+    assert response.status_code == 200
+    assert "max-age=" in response["Cache-Control"]
+    ocsp_response = ocsp.load_der_ocsp_response(response.content)
+    assert ocsp_response.certificate_status == ocsp.OCSPCertStatus.GOOD
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_ocsp_revoked(ca_cert: Certificate, certificate: Certificate) -> None:
+    await sync_to_async(Revocation.objects.revoke)(
+        certificate, RevocationReason.SUPERSEDED
+    )
+
+    response = await AsyncClient().post(
+        reverse("ocsp:post"),
+        _build_request(certificate, ca_cert),
+        content_type="application/ocsp-request",
+    )
+
+    ocsp_response = ocsp.load_der_ocsp_response(response.content)
+    assert ocsp_response.certificate_status == ocsp.OCSPCertStatus.REVOKED
+    assert ocsp_response.revocation_reason == x509.ReasonFlags.superseded
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_ocsp_unknown_certificate(
+    ca_cert: Certificate, certificate: Certificate
+) -> None:
+    await OCSPResponse.objects.all().adelete()
+
+    response = await AsyncClient().post(
+        reverse("ocsp:post"),
+        _build_request(certificate, ca_cert),
+        content_type="application/ocsp-request",
+    )
+
+    ocsp_response = ocsp.load_der_ocsp_response(response.content)
+    assert ocsp_response.response_status == ocsp.OCSPResponseStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_ocsp_malformed_request() -> None:
+    response = await AsyncClient().post(
+        reverse("ocsp:post"), b"garbage", content_type="application/ocsp-request"
+    )
+
+    ocsp_response = ocsp.load_der_ocsp_response(response.content)
+    assert ocsp_response.response_status == ocsp.OCSPResponseStatus.MALFORMED_REQUEST
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_ocsp_after_bulk_issuance(
+    ca_cert: Certificate, user: User, tmp_path: Path
+) -> None:
+    manifest = tmp_path.joinpath("manifest.jsonl")
+    manifest.write_text(
+        json.dumps({"email": user.email, "alternative_names": ["kuma.ai"]}) + "\n"
+    )
+    await sync_to_async(call_command)("issue_certificates", manifest, workers=1)
+    certificate = await Certificate.objects.aget(server__user=user)
+
+    response = await AsyncClient().post(
+        reverse("ocsp:post"),
+        _build_request(certificate, ca_cert),
+        content_type="application/ocsp-request",
+    )
+
+    ocsp_response = ocsp.load_der_ocsp_response(response.content)
+    assert ocsp_response.certificate_status == ocsp.OCSPCertStatus.GOOD